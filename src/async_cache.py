@@ -0,0 +1,67 @@
+"""Caching decorators for async methods keyed on their arguments.
+
+Used by MemecoinAnalyzer (token address), RiskCalculator (pair id) and
+SocialTracker (no arguments: one entry per method).
+"""
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Optional
+
+def singleflight(method):
+    """Share one in-flight call per (method, key) across concurrent callers.
+
+    The decorated class must define ``self._inflight = {}``.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+            
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await method(self, *args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; waiters still receive it
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+    return wrapper
+
+def ttl_cache(ttl: Optional[float], maxsize: int = 4096, cache_falsy: bool = True):
+    """Cache per-key results for ttl seconds (None: forever), LRU-bounded.
+
+    The decorated class must define ``self._ttl_caches = {}``. Stack above
+    @singleflight so concurrent misses still share one request.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            cache = self._ttl_caches.setdefault(method.__name__, OrderedDict())
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            entry = cache.get(key)
+            if entry is not None and (entry[1] is None or now < entry[1]):
+                cache.move_to_end(key)
+                return entry[0]
+                
+            result = await method(self, *args, **kwargs)
+            if result is not None and (cache_falsy or result):
+                cache[key] = (result, None if ttl is None else now + ttl)
+                cache.move_to_end(key)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+        return wrapper
+    return decorator
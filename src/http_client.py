@@ -0,0 +1,51 @@
+"""Process-wide aiohttp session.
+
+RiskCalculator and SocialTracker share one connection pool and DNS cache, so
+repeat calls to CoinGecko or Reddit skip the resolver and reuse warm TLS
+connections.
+"""
+import asyncio
+import atexit
+from typing import Optional
+
+import aiohttp
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session, creating it on first use in this event loop"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    # Sessions are bound to the loop that created them
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            ),
+            timeout=aiohttp.ClientTimeout(total=10),
+            headers={'Accept': 'application/json'}
+        )
+        _session_loop = loop
+    return _session
+
+async def close_session():
+    """Close the shared HTTP session"""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+@atexit.register
+def _close_at_exit():
+    """Close the session at exit if its event loop can still run it"""
+    if _session is None or _session.closed or _session_loop is None:
+        return
+    if _session_loop.is_closed() or _session_loop.is_running():
+        return
+    _session_loop.run_until_complete(close_session())
@@ -0,0 +1,19 @@
+"""Optional Numba JIT support.
+
+Numerical kernels are decorated with ``njit`` from here. When numba is not
+installed the decorator is a no-op, so the kernels still run as plain Python.
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -4,11 +4,13 @@ import logging
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 import json
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from pycoingecko import CoinGeckoAPI
 from binance.client import Client
 import requests
 
+from .async_cache import singleflight, ttl_cache
+
 logger = logging.getLogger(__name__)
 
 class MarketDataHandler:
@@ -46,9 +48,9 @@ class MarketDataHandler:
             }
         }
         
-        # Cache settings - much shorter duration
-        self._cache = {}
-        self._cache_duration = timedelta(seconds=5)  # Update every 5 seconds
+        # In-flight fetches and short-lived token data (see singleflight, ttl_cache)
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._ttl_caches: Dict[str, OrderedDict] = {}
         
         # API rate limits - more aggressive
         self._last_request = defaultdict(lambda: datetime.now() - timedelta(minutes=1))
@@ -58,15 +60,11 @@ class MarketDataHandler:
             'poocoin': 0.1     # 600 calls per minute
         }
         
+    @ttl_cache(5)  # Update every 5 seconds
+    @singleflight
     async def get_token_data(self, token_symbol: str) -> Optional[Dict]:
         """Get comprehensive token data from multiple sources"""
         try:
-            # Check cache but with very short duration
-            if token_symbol in self._cache:
-                cached = self._cache[token_symbol]
-                if datetime.now() - cached['timestamp'] < self._cache_duration:
-                    return cached['data']
-            
             # Get data from multiple sources
             tasks = [
                 self._get_binance_data(token_symbol),  # Fastest API first
@@ -82,15 +80,7 @@ class MarketDataHandler:
                 return None
             
             # Merge data preferring real-time sources
-            merged_data = self._merge_token_data(valid_results)
-            if merged_data:
-                self._cache[token_symbol] = {
-                    'data': merged_data,
-                    'timestamp': datetime.now()
-                }
-                return merged_data
-            
-            return None
+            return self._merge_token_data(valid_results) or None
             
         except Exception as e:
             logger.error(f"Error fetching token data: {str(e)}")
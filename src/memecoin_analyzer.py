@@ -1,13 +1,252 @@
 import asyncio
+import contextvars
+import functools
+import itertools
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
-from web3 import Web3
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from web3 import AsyncWeb3, Web3
 import json
-from decimal import Decimal
 import aiohttp
+import numpy as np
+import orjson
+
+from .async_cache import singleflight, ttl_cache
+from .jit import njit
+from .memecoin_scoring import combine_scores, match_patterns
+
+# GitHub conditional-GET cache: url -> (etag, parsed json, stored at)
+GITHUB_CACHE_TTL = 600  # 10 minutes
+_gh_cache: Dict[str, Tuple[str, Any, float]] = {}
+
+# Keyword scans, compiled once (substring matches, case-insensitive)
+_AI_RE = re.compile(r'ai|agent|gpt|neural|brain|smart|intel', re.I)
+_AGENT_RE = re.compile(r'agent|execute|interact|automate|delegate', re.I)
+_AI_FILE_RE = re.compile(r'ai|model|neural|train|inference|agent', re.I)
+
+@dataclass
+class PriceSeries:
+    """OHLCV price history as contiguous arrays (oldest first)"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    ts: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+# Minimal ERC-20 ABI, parsed once
+_TOKEN_ABI = json.loads('''[
+    {"constant": true, "inputs": [], "name": "name", "outputs": [{"name": "", "type": "string"}], "type": "function"},
+    {"constant": true, "inputs": [], "name": "symbol", "outputs": [{"name": "", "type": "string"}], "type": "function"},
+    {"constant": true, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "type": "function"},
+    {"constant": true, "inputs": [], "name": "totalSupply", "outputs": [{"name": "", "type": "uint256"}], "type": "function"},
+    {"constant": true, "inputs": [{"name": "owner", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], "type": "function"}
+]''')
+
+@functools.lru_cache(maxsize=4)
+def _w3_for_chain(chain: str) -> AsyncWeb3:
+    """Web3 connection for a chain, reused across tokens"""
+    rpc_url = os.getenv(f'{chain.upper()}_RPC_URL')
+    return AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
+
+@functools.lru_cache(maxsize=2048)
+def _token_contract(chain: str, token_address: str):
+    """Token contract instance, reused across calls for the same token"""
+    w3 = _w3_for_chain(chain)
+    return w3.eth.contract(address=Web3.to_checksum_address(token_address), abi=_TOKEN_ABI)
+
+@functools.lru_cache(maxsize=65536)
+def _detect_chain(token_address: str, base_chain_addrs: FrozenSet[str]) -> str:
+    """Chain for a token address, given the known (lowercased) Base token addresses"""
+    # Check address format
+    if token_address.startswith('0x'):
+        # Check if Base chain
+        if token_address.lower() in base_chain_addrs:
+            return 'base'
+        # Check if Solana address format
+        elif len(token_address) == 44:
+            return 'solana'
+        else:
+            return 'ethereum'
+    return 'unknown'
+
+# Indicators that failed (and scored 0) during the analyze_token call in progress.
+# gather copies the context into each indicator task, so they all append to one list
+_failed_indicators: contextvars.ContextVar = contextvars.ContextVar('failed_indicators', default=None)
+
+def _indicator_failed(name: str):
+    """Note that an indicator swallowed an error, so its analysis isn't persisted"""
+    failed = _failed_indicators.get()
+    if failed is not None:
+        failed.append(name)
+
+# Numba kernels must be free functions, so they live at module scope
+
+@njit(cache=True)
+def _trend_strength(close):
+    """Least-squares trend over the series, scaled by fit quality (0-1)"""
+    n = close.shape[0]
+    if n < 2:
+        return 0.0
+    sum_x = 0.0
+    sum_y = 0.0
+    for i in range(n):
+        sum_x += i
+        sum_y += close[i]
+    mean_x = sum_x / n
+    mean_y = sum_y / n
+    if mean_y <= 0.0:
+        return 0.0
+    sxx = 0.0
+    sxy = 0.0
+    syy = 0.0
+    for i in range(n):
+        dx = i - mean_x
+        dy = close[i] - mean_y
+        sxx += dx * dx
+        sxy += dx * dy
+        syy += dy * dy
+    if sxy <= 0.0 or syy == 0.0:
+        return 0.0
+    slope = sxy / sxx
+    r_squared = (sxy * sxy) / (sxx * syy)
+    # Relative rise across the window, weighted by how cleanly it trends
+    rise = slope * (n - 1) / mean_y
+    return min(rise, 1.0) * r_squared
+
+@njit(cache=True)
+def _volume_profile(volume, close, bins):
+    """Share of traded volume sitting at or below the latest price (0-1)"""
+    n = close.shape[0]
+    if n == 0:
+        return 0.0
+    low = close.min()
+    high = close.max()
+    if high <= low:
+        return 0.0
+    width = (high - low) / bins
+    profile = np.zeros(bins)
+    total = 0.0
+    for i in range(n):
+        idx = min(int((close[i] - low) / width), bins - 1)
+        profile[idx] += volume[i]
+        total += volume[i]
+    if total <= 0.0:
+        return 0.0
+    current = min(int((close[n - 1] - low) / width), bins - 1)
+    support = 0.0
+    for b in range(current + 1):
+        support += profile[b]
+    return support / total
+
+@njit(cache=True)
+def _chart_patterns(high, low, close, window):
+    """Pivot-based pattern strengths: (higher_lows, breakout)"""
+    n = close.shape[0]
+    if n < 2 * window + 1:
+        return 0.0, 0.0
+    pivots = 0
+    rising = 0
+    last_pivot_low = -1.0
+    pivot_high = 0.0
+    for i in range(window, n - window):
+        is_low = True
+        for j in range(i - window, i + window + 1):
+            if low[j] < low[i]:
+                is_low = False
+                break
+        if is_low:
+            if last_pivot_low >= 0.0:
+                pivots += 1
+                if low[i] > last_pivot_low:
+                    rising += 1
+            last_pivot_low = low[i]
+        if high[i] > pivot_high:
+            pivot_high = high[i]
+    higher_lows = rising / pivots if pivots > 0 else 0.0
+    breakout = 0.0
+    if pivot_high > 0.0 and close[n - 1] > pivot_high:
+        breakout = min((close[n - 1] - pivot_high) / pivot_high * 10.0, 1.0)
+    return higher_lows, breakout
+
+class AnalysisCache:
+    """SQLite-backed store of recent token analyses, kept across restarts.
+
+    Queries run in a worker thread so the event loop never waits on disk; the
+    database is opened on first use.
+    """
+
+    def __init__(self, path: str = 'database/analysis_cache.db', ttl: int = 1800):
+        self.path = path
+        self.ttl = ttl
+        self.conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()  # One query at a time on the shared connection
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (caller holds the lock)"""
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS analysis_cache ('
+                'token_address TEXT PRIMARY KEY, results BLOB NOT NULL, expires_at REAL NOT NULL)'
+            )
+            conn.commit()
+            self.conn = conn
+        return self.conn
+
+    def _get(self, token_address: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT results FROM analysis_cache WHERE token_address = ? AND expires_at > ?',
+                (token_address, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, token_address: str, payload: bytes):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?)',
+                (token_address, payload, time.time() + self.ttl)
+            )
+            conn.commit()
+
+    async def get(self, token_address: str) -> Optional[Dict]:
+        """Return cached results for a token, or None if missing/expired"""
+        payload = await asyncio.to_thread(self._get, token_address)
+        return orjson.loads(payload) if payload is not None else None
+
+    async def set(self, token_address: str, results: Dict):
+        """Store results for a token"""
+        payload = orjson.dumps(results, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        await asyncio.to_thread(self._set, token_address, payload)
+
+    def close(self):
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
 
 class MemecoinAnalyzer:
+    # Function-name substrings that mark security features, in priority order
+    _SEC_PATTERNS = (
+        ('owner', 'has_ownership'),
+        ('pause', 'has_pause'),
+        ('blacklist', 'has_blacklist'),
+        ('maxtransaction', 'has_max_tx'),
+        ('maxamount', 'has_max_tx')
+    )
+    
     def __init__(self):
         self.indicators = {
             'liquidity': self.analyze_liquidity,
@@ -56,41 +295,83 @@ class MemecoinAnalyzer:
             'volume_threshold': 50_000        # $50k minimum volume for graduated
         }
         
+        # Shared HTTP session, created lazily on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # In-flight requests shared by concurrent callers (see singleflight)
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        
+        # Short-lived per-token results (see ttl_cache)
+        self._ttl_caches: Dict[str, OrderedDict] = {}
+        
+        # Known Base token addresses, so chain detection needs no RPC
+        self._base_chain_addrs: FrozenSet[str] = self._load_base_chain_addrs()
+        
+        # Recent analyses persisted to disk so restarts start warm
+        self._disk_cache = AnalysisCache()
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+        
+    async def close(self):
+        """Close the shared HTTP session and the analysis cache"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._disk_cache.close()
+        
+    def _load_base_chain_addrs(self, path: str = 'config/base_tokens.json') -> FrozenSet[str]:
+        """Load known Base token addresses (lowercased) from config"""
+        try:
+            with open(path, 'r') as f:
+                return frozenset(addr.lower() for addr in json.load(f))
+        except FileNotFoundError:
+            logging.warning(f"Base token list {path} not found; no token will be detected as Base")
+            return frozenset()
+        except Exception as e:
+            logging.error(f"Error loading Base token list: {str(e)}")
+            return frozenset()
+        
     async def analyze_token(self, token_address: str) -> Dict:
         """Complete token analysis"""
         try:
-            results = {}
-            
+            cached = await self._disk_cache.get(token_address)
+            if cached is not None:
+                return cached
+                
             # Run all indicators concurrently
             tasks = [
                 indicator(token_address)
                 for indicator in self.indicators.values()
             ]
             
-            scores = await asyncio.gather(*tasks)
+            failed: List[str] = []
+            context = _failed_indicators.set(failed)
+            try:
+                scores = await asyncio.gather(*tasks)
+            finally:
+                _failed_indicators.reset(context)
             
             # Combine scores with weights
-            weights = {
-                'liquidity': 20,
-                'holders': 15,
-                'contract': 25,
-                'momentum': 15,
-                'volume': 15,
-                'social': 10,
-                'ai_relevance': 10
-            }
+            results, total_score = combine_scores(scores)
             
-            total_score = 0
-            for score, (name, weight) in zip(scores, weights.items()):
-                results[name] = score
-                total_score += score * weight / 100
-                
             results['total_score'] = total_score
-            results['analysis_time'] = datetime.now()
+            results['analysis_time'] = time.time()  # Epoch seconds; format at render time
             
             # Add pattern recognition
-            results['patterns'] = await self.identify_patterns(results)
+            results['patterns'] = self.identify_patterns(results)
             
+            # A failed indicator scores 0; don't persist that as the token's real score
+            if failed:
+                logging.warning(f"Not caching analysis of {token_address}: {', '.join(failed)} failed")
+            else:
+                await self._disk_cache.set(token_address, results)
             return results
             
         except Exception as e:
@@ -134,6 +415,7 @@ class MemecoinAnalyzer:
             
         except Exception as e:
             logging.error(f"Liquidity analysis error: {str(e)}")
+            _indicator_failed('liquidity')
             return 0
             
     async def analyze_contract(self, token_address: str) -> float:
@@ -183,6 +465,7 @@ class MemecoinAnalyzer:
             
         except Exception as e:
             logging.error(f"Contract analysis error: {str(e)}")
+            _indicator_failed('contract')
             return 0
             
     async def analyze_price_momentum(self, token_address: str) -> float:
@@ -210,6 +493,7 @@ class MemecoinAnalyzer:
             
         except Exception as e:
             logging.error(f"Momentum analysis error: {str(e)}")
+            _indicator_failed('momentum')
             return 0
             
     async def analyze_ai_relevance(self, token_address: str) -> float:
@@ -217,6 +501,8 @@ class MemecoinAnalyzer:
         try:
             score = 0
             token_data = await self.get_token_metadata(token_address)
+            if not token_data:
+                raise ValueError("no token metadata")  # get_token_metadata logged the cause
             
             # Check for AI-related features (40 points)
             ai_features = {
@@ -245,77 +531,13 @@ class MemecoinAnalyzer:
             
         except Exception as e:
             logging.error(f"AI relevance analysis error: {str(e)}")
+            _indicator_failed('ai_relevance')
             return 0
             
-    async def identify_patterns(self, analysis_results: Dict) -> List[Dict]:
+    def identify_patterns(self, analysis_results: Dict) -> List[Dict]:
         """Identify bullish patterns in token data"""
         try:
-            patterns = []
-            
-            # Check for organic growth pattern
-            if (analysis_results['holders'] > 70 and
-                analysis_results['volume'] > 60 and
-                analysis_results['momentum'] > 60):
-                patterns.append({
-                    'name': 'organic_growth',
-                    'confidence': min(
-                        analysis_results['holders'],
-                        analysis_results['volume'],
-                        analysis_results['momentum']
-                    ) / 100,
-                    'indicators': {
-                        'holders': analysis_results['holders'],
-                        'volume': analysis_results['volume'],
-                        'momentum': analysis_results['momentum']
-                    }
-                })
-                
-            # Check for viral potential
-            if (analysis_results['social'] > 80 and
-                analysis_results['momentum'] > 70):
-                patterns.append({
-                    'name': 'viral_potential',
-                    'confidence': min(
-                        analysis_results['social'],
-                        analysis_results['momentum']
-                    ) / 100,
-                    'indicators': {
-                        'social': analysis_results['social'],
-                        'momentum': analysis_results['momentum']
-                    }
-                })
-                
-            # Check for AI trend
-            if (analysis_results['ai_relevance'] > 70 and
-                analysis_results['momentum'] > 60):
-                patterns.append({
-                    'name': 'ai_trend',
-                    'confidence': min(
-                        analysis_results['ai_relevance'],
-                        analysis_results['momentum']
-                    ) / 100,
-                    'indicators': {
-                        'ai_relevance': analysis_results['ai_relevance'],
-                        'momentum': analysis_results['momentum']
-                    }
-                })
-                
-            # Check for whale accumulation
-            if (analysis_results['volume'] > 70 and
-                analysis_results['holders'] > 60):
-                patterns.append({
-                    'name': 'whale_accumulation',
-                    'confidence': min(
-                        analysis_results['volume'],
-                        analysis_results['holders']
-                    ) / 100,
-                    'indicators': {
-                        'volume': analysis_results['volume'],
-                        'holders': analysis_results['holders']
-                    }
-                })
-                
-            return patterns
+            return match_patterns(analysis_results)
             
         except Exception as e:
             logging.error(f"Pattern identification error: {str(e)}")
@@ -347,7 +569,7 @@ class MemecoinAnalyzer:
 
             # 2. Check market cap
             market_data = await self._get_market_data(token_address)
-            analysis['market_cap'] = market_data['market_cap']
+            analysis['market_cap'] = float(market_data['market_cap'])
             
             if not (self.NICK_FILTERS['min_market_cap'] <= analysis['market_cap'] <= self.NICK_FILTERS['max_market_cap']):
                 analysis['recommendation'] = f"AVOID: Market cap outside safe range (${analysis['market_cap']:,.0f})"
@@ -415,22 +637,19 @@ class MemecoinAnalyzer:
             # Get recent trades
             trades = await self._get_recent_trades(token_address)
             
-            # Check trading platforms diversity
-            for trade in trades:
-                volume_data['unique_platforms'].add(trade.get('platform', 'unknown'))
-
-            # Flag suspicious patterns
-            platform_trades = defaultdict(list)
-            for trade in trades:
-                platform = trade.get('platform', 'unknown')
-                platform_trades[platform].append(trade)
-
-            # Check for wash trading patterns
-            for platform, platform_trades in platform_trades.items():
+            # Group trades by platform (stable sort keeps time order per platform)
+            def platform_of(trade):
+                return trade.get('platform', 'unknown')
+                
+            for platform, group in itertools.groupby(sorted(trades, key=platform_of), key=platform_of):
+                platform_trades = list(group)
+                volume_data['unique_platforms'].add(platform)
+                
+                # Check for wash trading patterns
                 if len(platform_trades) >= 10:
                     # Check for identical amounts
-                    amounts = [t['amount'] for t in platform_trades]
-                    if len(set(amounts)) < len(amounts) * 0.7:  # 70% unique
+                    amounts = np.fromiter((t['amount'] for t in platform_trades), dtype=np.float64, count=len(platform_trades))
+                    if len(np.unique(amounts)) < len(amounts) * 0.7:  # 70% unique
                         volume_data['suspicious_patterns'].append(f"Identical amounts on {platform}")
 
                     # Check for regular time intervals
@@ -558,41 +777,44 @@ class MemecoinAnalyzer:
             return {'is_community_driven': False}
 
     # Helper methods to be implemented
+    @singleflight
     async def get_liquidity_data(self, token_address: str) -> Dict:
         """Get liquidity data for token"""
         pass
         
+    @singleflight
     async def get_contract_data(self, token_address: str) -> Dict:
         """Get contract data and features"""
         pass
         
-    async def get_price_history(self, token_address: str) -> List[Dict]:
+    async def get_price_history(self, token_address: str) -> PriceSeries:
         """Get price history data"""
         pass
         
-    def calculate_trend_strength(self, prices: List[Dict]) -> float:
+    def calculate_trend_strength(self, prices: PriceSeries) -> float:
         """Calculate trend strength"""
-        pass
+        return float(_trend_strength(prices.close))
         
-    def analyze_volume_profile(self, prices: List[Dict]) -> float:
+    def analyze_volume_profile(self, prices: PriceSeries) -> float:
         """Analyze volume profile"""
-        pass
+        return float(_volume_profile(prices.volume, prices.close, 20))
         
-    def identify_chart_patterns(self, prices: List[Dict]) -> List[Dict]:
+    def identify_chart_patterns(self, prices: PriceSeries) -> List[Dict]:
         """Identify technical chart patterns"""
-        pass
+        higher_lows, breakout = _chart_patterns(prices.high, prices.low, prices.close, 3)
+        patterns = []
+        if higher_lows > 0:
+            patterns.append({'name': 'higher_lows', 'strength': float(higher_lows) / 2})
+        if breakout > 0:
+            patterns.append({'name': 'breakout', 'strength': float(breakout) / 2})
+        return patterns
 
+    @singleflight
     async def get_token_metadata(self, token_address: str) -> Dict:
         """Get token metadata including AI features"""
         try:
-            # Initialize web3 connection based on chain
-            w3 = self.get_web3_connection(token_address)
-            
-            # Get token contract
-            contract = w3.eth.contract(
-                address=w3.to_checksum_address(token_address),
-                abi=self.get_token_abi()
-            )
+            # Get token contract (connection and contract are cached)
+            contract = self.get_contract(token_address)
             
             # Basic token info
             metadata = {
@@ -605,21 +827,21 @@ class MemecoinAnalyzer:
             }
             
             # Check for AI features in token name/symbol
-            ai_keywords = ['ai', 'agent', 'gpt', 'neural', 'brain', 'smart', 'intel']
-            if any(kw in metadata['name'].lower() for kw in ai_keywords) or \
-               any(kw in metadata['symbol'].lower() for kw in ai_keywords):
+            if _AI_RE.search(metadata['name']) or _AI_RE.search(metadata['symbol']):
                 metadata['features'].append('ai_functionality')
             
-            # Get social links and documentation from token website
-            social_data = await self.fetch_token_social_data(token_address)
+            # Social data, agent integration and tech validation are independent
+            social_data, has_agent_integration, is_tech_valid = await asyncio.gather(
+                self.fetch_token_social_data(token_address),
+                self.check_agent_integration(token_address),
+                self.validate_tech_implementation(token_address)
+            )
             metadata.update(social_data)
             
-            # Check for agent integration
-            if await self.check_agent_integration(token_address):
+            if has_agent_integration:
                 metadata['features'].append('agent_integration')
             
-            # Validate technical implementation
-            if await self.validate_tech_implementation(token_address):
+            if is_tech_valid:
                 metadata['features'].append('tech_validation')
             
             return metadata
@@ -642,73 +864,78 @@ class MemecoinAnalyzer:
             owner = parts[-2]
             repo = parts[-1]
             
-            # Initialize aiohttp session
-            async with aiohttp.ClientSession() as session:
-                # Get repository info
-                async with session.get(
-                    f'https://api.github.com/repos/{owner}/{repo}',
-                    headers={'Accept': 'application/vnd.github.v3+json'}
-                ) as response:
-                    if response.status != 200:
-                        return False
-                    repo_data = await response.json()
-                
-                # Check recent commits
-                async with session.get(
-                    f'https://api.github.com/repos/{owner}/{repo}/commits',
-                    headers={'Accept': 'application/vnd.github.v3+json'}
-                ) as response:
-                    if response.status != 200:
-                        return False
-                    commits = await response.json()
-                
-                # Check AI-related files and activity
-                async with session.get(
-                    f'https://api.github.com/repos/{owner}/{repo}/contents',
-                    headers={'Accept': 'application/vnd.github.v3+json'}
-                ) as response:
-                    if response.status != 200:
-                        return False
-                    contents = await response.json()
-                
-                # Scoring criteria
-                score = 0
-                
-                # Recent activity (up to 20 points)
-                if len(commits) >= 10:  # Active development
-                    score += 20
-                elif len(commits) >= 5:
-                    score += 10
-                
-                # Repository stats (up to 20 points)
-                if repo_data.get('stargazers_count', 0) > 100:
-                    score += 10
-                if repo_data.get('forks_count', 0) > 20:
-                    score += 10
-                
-                # AI-related files check (up to 60 points)
-                ai_keywords = ['ai', 'model', 'neural', 'train', 'inference', 'agent']
-                ai_files = 0
-                
-                for item in contents:
-                    if item['type'] == 'file':
-                        name_lower = item['name'].lower()
-                        if any(kw in name_lower for kw in ai_keywords):
-                            ai_files += 1
-                
-                if ai_files >= 5:
-                    score += 60
-                elif ai_files >= 3:
-                    score += 40
-                elif ai_files >= 1:
-                    score += 20
-                
-                return score >= 60  # Consider active if score is 60 or higher
+            # Fetch repository info, recent commits and contents concurrently
+            base_url = f'https://api.github.com/repos/{owner}/{repo}'
+            repo_data, commits, contents = await asyncio.gather(
+                self._fetch_github_json(base_url),
+                self._fetch_github_json(f'{base_url}/commits'),
+                self._fetch_github_json(f'{base_url}/contents')
+            )
+            if repo_data is None or commits is None or contents is None:
+                return False
                 
+            # Scoring criteria
+            score = 0
+            
+            # Recent activity (up to 20 points)
+            if len(commits) >= 10:  # Active development
+                score += 20
+            elif len(commits) >= 5:
+                score += 10
+            
+            # Repository stats (up to 20 points)
+            if repo_data.get('stargazers_count', 0) > 100:
+                score += 10
+            if repo_data.get('forks_count', 0) > 20:
+                score += 10
+            
+            # AI-related files check (up to 60 points)
+            ai_files = 0
+            for item in contents:
+                if item['type'] == 'file' and _AI_FILE_RE.search(item['name']):
+                    ai_files += 1
+                    if ai_files >= 5:  # Max score reached, no need to scan further
+                        break
+            
+            if ai_files >= 5:
+                score += 60
+            elif ai_files >= 3:
+                score += 40
+            elif ai_files >= 1:
+                score += 20
+            
+            return score >= 60  # Consider active if score is 60 or higher
+            
         except Exception as e:
             logging.error(f"Error checking GitHub activity: {str(e)}")
             return False
 
+    async def _fetch_github_json(self, url: str):
+        """GET a GitHub API endpoint, returning parsed JSON or None on failure.
+
+        Sends If-None-Match with the cached ETag so unchanged resources come
+        back as 304s, which are free against the GitHub rate limit.
+        """
+        headers = {'Accept': 'application/vnd.github.v3+json'}
+        cached = _gh_cache.get(url)
+        if cached and time.time() - cached[2] < GITHUB_CACHE_TTL:
+            headers['If-None-Match'] = cached[0]
+        else:
+            cached = None
+            _gh_cache.pop(url, None)
+            
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and cached:
+                return cached[1]
+            if response.status != 200:
+                return None
+            data = await response.json()
+            etag = response.headers.get('ETag')
+            if etag:
+                _gh_cache[url] = (etag, data, time.time())
+            return data
+
     async def check_agent_integration(self, token_address: str) -> bool:
         """Check if token has agent integration capabilities"""
         try:
@@ -716,11 +943,9 @@ class MemecoinAnalyzer:
             contract = self.get_contract(token_address)
             functions = contract.all_functions()
             
-            agent_keywords = ['agent', 'execute', 'interact', 'automate', 'delegate']
-            
             # Check function names for agent-related keywords
             for func in functions:
-                if any(kw in func.fn_name.lower() for kw in agent_keywords):
+                if _AGENT_RE.search(func.fn_name):
                     return True
             
             # Check for integration with known agent platforms
@@ -754,22 +979,23 @@ class MemecoinAnalyzer:
             }
             
             # Check for standard security features
+            found = 0
             for func in contract.all_functions():
                 name = func.fn_name.lower()
-                if 'owner' in name:
-                    security_features['has_ownership'] = True
-                elif 'pause' in name:
-                    security_features['has_pause'] = True
-                elif 'blacklist' in name:
-                    security_features['has_blacklist'] = True
-                elif 'maxtransaction' in name or 'maxamount' in name:
-                    security_features['has_max_tx'] = True
-            
-            # Check source code verification
-            is_verified = await self.is_contract_verified(token_address)
-            
-            # Check for common vulnerabilities
-            vulnerabilities = await self.scan_for_vulnerabilities(token_address)
+                for pattern, feature in self._SEC_PATTERNS:
+                    if pattern in name:
+                        if not security_features[feature]:
+                            security_features[feature] = True
+                            found += 1
+                        break
+                if found == len(security_features):  # Every feature seen
+                    break
+            
+            # Check source code verification and common vulnerabilities
+            is_verified, vulnerabilities = await asyncio.gather(
+                self.is_contract_verified(token_address),
+                self.scan_for_vulnerabilities(token_address)
+            )
             
             # Score the implementation
             score = 0
@@ -791,20 +1017,23 @@ class MemecoinAnalyzer:
             logging.error(f"Error validating tech implementation: {str(e)}")
             return False
 
+    def get_web3_connection(self, token_address: str) -> AsyncWeb3:
+        """Get the Web3 connection for the token's chain"""
+        return _w3_for_chain(self.detect_chain(token_address))
+        
+    def get_token_abi(self) -> List[Dict]:
+        """Get the ERC-20 token ABI"""
+        return _TOKEN_ABI
+        
+    def get_contract(self, token_address: str):
+        """Get the token contract instance"""
+        return _token_contract(self.detect_chain(token_address), token_address)
+        
     def detect_chain(self, token_address: str) -> str:
         """Detect which chain the token is on based on address format and RPC"""
         try:
-            # Check address format
-            if token_address.startswith('0x'):
-                # Check if Base chain
-                if self.is_base_chain(token_address):
-                    return 'base'
-                # Check if Solana address format
-                elif len(token_address) == 44:
-                    return 'solana'
-                else:
-                    return 'ethereum'
-            return 'unknown'
+            # Cached per address and Base token list, so analyzers aren't held by the cache
+            return _detect_chain(token_address, self._base_chain_addrs)
         except Exception as e:
             logging.error(f"Chain detection error: {str(e)}")
             return 'unknown'
@@ -824,24 +1053,24 @@ class MemecoinAnalyzer:
             # Get contract data
             contract = self.get_contract(token_address)
             
-            # Get holder data
-            holders = await self.get_holder_data(token_address)
+            # Holder, market and community data are independent RPC fetches
+            holders, market_data, community_data = await asyncio.gather(
+                self.get_holder_data(token_address),
+                self.get_market_data(token_address),
+                self.analyze_community(token_address)
+            )
             social_data['holder_count'] = holders['total_holders']
-            
-            # Calculate market metrics
-            market_data = await self.get_market_data(token_address)
             social_data['market_cap'] = market_data['market_cap']
             
             # Early stage detection (key from video)
             if 0 < market_data['market_cap'] <= 50_000_000:  # Below 50M mcap
                 social_data['early_stage'] = True
-                social_data['growth_potential'] = self.calculate_growth_potential(market_data)
+                social_data['growth_potential'] = await self.calculate_growth_potential(market_data)
             else:
                 social_data['early_stage'] = False
                 social_data['growth_potential'] = 0
                 
             # Community analysis
-            community_data = await self.analyze_community(token_address)
             social_data.update(community_data)
             
             return social_data
@@ -957,11 +1186,20 @@ class MemecoinAnalyzer:
             logging.error(f"Organic growth check error: {str(e)}")
             return False
 
+    @singleflight
     async def get_holder_distribution(self, token_address: str) -> Dict:
         """Get detailed holder distribution data"""
         # Implementation to be added
         pass
 
+    @singleflight
+    async def get_holder_data(self, token_address: str) -> Dict:
+        """Get holder count data"""
+        # Implementation to be added
+        pass
+
+    @ttl_cache(300)
+    @singleflight
     async def get_token_history(self, token_address: str, days: int) -> List:
         """Get historical token data"""
         # Implementation to be added
@@ -982,16 +1220,18 @@ class MemecoinAnalyzer:
         # Implementation to be added
         pass
 
-    async def is_base_chain(self, token_address: str) -> bool:
+    def is_base_chain(self, token_address: str) -> bool:
         """Check if token is on Base chain"""
-        # Implementation to be added
-        pass
+        return token_address.lower() in self._base_chain_addrs
 
+    @ttl_cache(30)  # Market cap moves slowly
+    @singleflight
     async def get_market_data(self, token_address: str) -> Dict:
         """Get market data for token"""
         # Implementation to be added
         pass
 
+    @singleflight
     async def get_community_engagement_score(self, token_address: str) -> float:
         """Get community engagement score"""
         # Implementation to be added
@@ -1002,11 +1242,15 @@ class MemecoinAnalyzer:
         # Implementation to be added
         pass
 
+    @ttl_cache(None, cache_falsy=False)  # Verification never reverts
+    @singleflight
     async def is_contract_verified(self, token_address: str) -> bool:
         """Check if contract is verified on block explorer"""
         # Implementation to be added
         pass
 
+    @ttl_cache(3600)
+    @singleflight
     async def scan_for_vulnerabilities(self, token_address: str) -> List[str]:
         """Scan contract for common vulnerabilities"""
         # Implementation to be added
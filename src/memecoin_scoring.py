@@ -0,0 +1,47 @@
+"""Score combining and pattern matching for MemecoinAnalyzer.
+
+Kept free of I/O and dynamic features so it can be compiled with mypyc
+(``mypyc src/memecoin_scoring.py``); it runs unchanged as plain Python.
+"""
+from typing import Any, Dict, List, Tuple
+
+# Indicator weights (percent), in MemecoinAnalyzer.indicators order
+SCORE_WEIGHTS: Dict[str, float] = {
+    'liquidity': 20,
+    'holders': 15,
+    'contract': 25,
+    'momentum': 15,
+    'volume': 15,
+    'social': 10,
+    'ai_relevance': 10
+}
+
+# Bullish pattern rules: (name, indicator keys, minimum scores)
+PATTERN_RULES: Tuple[Tuple[str, Tuple[str, ...], Tuple[float, ...]], ...] = (
+    ('organic_growth', ('holders', 'volume', 'momentum'), (70, 60, 60)),
+    ('viral_potential', ('social', 'momentum'), (80, 70)),
+    ('ai_trend', ('ai_relevance', 'momentum'), (70, 60)),
+    ('whale_accumulation', ('volume', 'holders'), (70, 60))
+)
+
+def combine_scores(scores: List[float]) -> Tuple[Dict[str, float], float]:
+    """Map indicator scores to names and compute the weighted total"""
+    results: Dict[str, float] = {}
+    total = 0.0
+    for score, (name, weight) in zip(scores, SCORE_WEIGHTS.items()):
+        results[name] = score
+        total += score * weight / 100
+    return results, total
+
+def match_patterns(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the bullish patterns whose indicator thresholds are all exceeded"""
+    patterns: List[Dict[str, Any]] = []
+    for name, keys, thresholds in PATTERN_RULES:
+        values = [results[key] for key in keys]
+        if all(value > threshold for value, threshold in zip(values, thresholds)):
+            patterns.append({
+                'name': name,
+                'confidence': min(values) / 100,
+                'indicators': dict(zip(keys, values))
+            })
+    return patterns
@@ -1,14 +1,63 @@
 import asyncio
-import json
+import functools
+import itertools
+from collections import deque
 import logging
+import time
 from typing import Dict, List, Optional, Set
 from datetime import datetime
 import aiohttp
 from dataclasses import dataclass
 import numpy as np
+import orjson
 import winsound
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from .jit import NUMBA_AVAILABLE, njit
+
+# Alert tone frequencies (Hz)
+SOUND_FREQUENCIES = {
+    'opportunity': 1000,
+    'alert': 800,
+    'warning': 600
+}
+
+# Alert conditions encoded as a sign so one comparison covers both:
+# sign * (current - threshold) > 0
+CONDITION_SIGNS = {
+    'above': 1,
+    'below': -1
+}
+
+def _epoch_seconds(value) -> Optional[float]:
+    """Normalize an expiry (epoch seconds or ISO string) to epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+@functools.lru_cache(maxsize=None)
+def _tone_frames(freq: int, framerate: int = 44100, seconds: float = 1.0) -> bytes:
+    """16-bit mono PCM frames for a sine tone, computed once per frequency"""
+    t = np.arange(int(framerate * seconds), dtype=np.float64)
+    samples = (32767.0 * np.sin(2.0 * np.pi * freq * t / framerate)).astype('<i2')
+    return samples.tobytes()
+
+@njit(cache=True, boundscheck=False)
+def _check_kernel(prices, pair_ix, thresholds, sign, expires, triggered, now, out):
+    """Fused alert check: writes hit ids to out, marks them triggered, returns the count"""
+    count = 0
+    for i in range(thresholds.shape[0]):
+        if triggered[i] or now > expires[i]:
+            continue
+        if sign[i] * (prices[pair_ix[i]] - thresholds[i]) > 0:
+            triggered[i] = True
+            out[count] = i
+            count += 1
+    return count
 
 @dataclass
 class PriceAlert:
@@ -17,14 +66,18 @@ class PriceAlert:
     price: float
     notification_type: str  # 'sound', 'popup', 'both'
     created_at: datetime
-    expires_at: Optional[datetime] = None
+    expires_at: Optional[float] = None  # Epoch seconds
     triggered: bool = False
 
 class PriceAlertManager:
+    # Per-alert NumPy columns, parallel to self.alerts
+    _ARRAY_FIELDS = ('_prices', '_sign', '_expires', '_triggered_mask', '_pair_ix')
+    
     def __init__(self):
         self.alerts: List[PriceAlert] = []
         self.triggered_alerts: Set[int] = set()
         self.sound_enabled = True
+        self._reset_arrays()
         
         # Create sounds directory if it doesn't exist
         self.sounds_dir = Path("sounds")
@@ -39,12 +92,18 @@ class PriceAlertManager:
         
         # Create default sound files if they don't exist
         self.create_default_sounds()
+        
+        # Keep the WAV data in memory so alerts don't re-read files from disk
+        self._sound_bufs = self.load_sounds()
+        
+        # winsound can't play from memory asynchronously, so play on a worker
+        self._sound_executor = ThreadPoolExecutor(max_workers=1)
+        self._sound_future = None  # At most one sound playing or queued
     
     def create_default_sounds(self):
         """Create default sound files using Windows beeps"""
         try:
             import wave
-            import struct
             
             for sound_type, filename in self.sounds.items():
                 if not os.path.exists(filename):
@@ -54,29 +113,86 @@ class PriceAlertManager:
                         nchannels = 1
                         sampwidth = 2
                         framerate = 44100
-                        nframes = framerate  # 1 second
                         
                         # Set WAV file parameters
                         wav_file.setnchannels(nchannels)
                         wav_file.setsampwidth(sampwidth)
                         wav_file.setframerate(framerate)
                         
-                        # Generate different frequencies for different alerts
-                        if sound_type == 'opportunity':
-                            freq = 1000
-                        elif sound_type == 'alert':
-                            freq = 800
-                        else:
-                            freq = 600
-                        
-                        # Generate sound wave
-                        for i in range(nframes):
-                            value = int(32767.0 * np.sin(2.0 * np.pi * freq * i / framerate))
-                            data = struct.pack('<h', value)
-                            wav_file.writeframes(data)
+                        # Different frequencies for different alerts, 1 second each
+                        freq = SOUND_FREQUENCIES.get(sound_type, 600)
+                        wav_file.writeframes(_tone_frames(freq, framerate))
         except Exception as e:
             logging.error(f"Error creating sound files: {str(e)}")
     
+    def load_sounds(self) -> Dict[str, bytes]:
+        """Read the sound files into memory"""
+        buffers = {}
+        for sound_type, filename in self.sounds.items():
+            try:
+                buffers[sound_type] = Path(filename).read_bytes()
+            except OSError as e:
+                logging.error(f"Error loading sound {filename}: {str(e)}")
+        return buffers
+    
+    def _reset_arrays(self, capacity: int = 64):
+        """Reset the structure-of-arrays alert storage"""
+        self._count = 0
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._sign = np.zeros(capacity, dtype=np.int8)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._triggered_mask = np.zeros(capacity, dtype=bool)
+        self._pair_ix = np.zeros(capacity, dtype=np.int32)
+        
+        # Each distinct pair is hashed once; alerts refer to it by index
+        self._known_pairs: List[str] = []
+        self._pair_to_ix: Dict[str, int] = {}
+    
+    def _append_arrays(self, alert: PriceAlert):
+        """Append an alert to the array storage, doubling capacity when full"""
+        if self._count == len(self._prices):
+            for name in self._ARRAY_FIELDS:
+                old = getattr(self, name)
+                new = np.zeros(len(old) * 2, dtype=old.dtype)
+                new[:self._count] = old[:self._count]
+                setattr(self, name, new)
+        
+        i = self._count
+        expires_at = alert.expires_at
+        self._prices[i] = alert.price
+        self._sign[i] = CONDITION_SIGNS.get(alert.condition, 0)
+        # Expiry is kept as a time.monotonic() deadline for the hot path
+        self._expires[i] = time.monotonic() + (expires_at - time.time()) if expires_at else np.inf
+        self._triggered_mask[i] = False
+        self._pair_ix[i] = self.pair_index(alert.pair)
+        self._count += 1
+    
+    @property
+    def known_pairs(self) -> List[str]:
+        """Pairs with alerts, in the order check_alerts_array expects prices"""
+        return self._known_pairs
+    
+    def pair_index(self, pair: str) -> int:
+        """Get the price-vector index for a pair, registering it if new"""
+        ix = self._pair_to_ix.get(pair)
+        if ix is None:
+            ix = len(self._known_pairs)
+            self._pair_to_ix[pair] = ix
+            self._known_pairs.append(pair)
+        return ix
+    
+    def _rebuild_arrays(self, alerts: List[PriceAlert]):
+        """Rebuild the array storage from alerts, leaving it untouched on failure"""
+        saved = {name: getattr(self, name) for name in self._ARRAY_FIELDS + ('_count', '_known_pairs', '_pair_to_ix')}
+        try:
+            self._reset_arrays(max(64, len(alerts)))
+            for alert in alerts:
+                self._append_arrays(alert)
+        except Exception:
+            for name, value in saved.items():
+                setattr(self, name, value)
+            raise
+    
     def add_alert(
         self,
         pair: str,
@@ -88,9 +204,7 @@ class PriceAlertManager:
         """Add a new price alert"""
         try:
             now = datetime.now()
-            expires_at = None
-            if duration_hours:
-                expires_at = now.timestamp() + (duration_hours * 3600)
+            expires_at = time.time() + duration_hours * 3600 if duration_hours else None
             
             alert = PriceAlert(
                 pair=pair,
@@ -103,6 +217,7 @@ class PriceAlertManager:
             )
             
             self.alerts.append(alert)
+            self._append_arrays(alert)
             return True
             
         except Exception as e:
@@ -114,6 +229,14 @@ class PriceAlertManager:
         try:
             if 0 <= alert_id < len(self.alerts):
                 self.alerts.pop(alert_id)
+                
+                # Shift the array columns down over the removed slot
+                n = self._count
+                for name in self._ARRAY_FIELDS:
+                    arr = getattr(self, name)
+                    arr[alert_id:n - 1] = arr[alert_id + 1:n]
+                self._count -= 1
+                self.triggered_alerts = set(np.flatnonzero(self._triggered_mask[:self._count]).tolist())
                 return True
             return False
         except Exception as e:
@@ -124,35 +247,79 @@ class PriceAlertManager:
         """Clear all alerts"""
         self.alerts = []
         self.triggered_alerts.clear()
+        self._reset_arrays()
     
     async def check_alerts(self, current_prices: Dict[str, float]):
         """Check all active alerts against current prices"""
-        now = datetime.now().timestamp()
-        triggered = []
+        if self._count == 0:
+            return []
+            
+        # Missing or zero prices become NaN, which never satisfies a comparison
+        prices = np.fromiter(
+            (current_prices.get(pair) or np.nan for pair in self._known_pairs),
+            dtype=np.float64,
+            count=len(self._known_pairs)
+        )
+        return self.check_alerts_array(prices)
+    
+    def check_alerts_array(self, prices: np.ndarray):
+        """Check all active alerts against a price vector ordered like known_pairs"""
+        # The numba kernel skips bounds checks, so a short vector must not reach it
+        if len(prices) != len(self._known_pairs):
+            raise ValueError(f"Expected {len(self._known_pairs)} prices (one per known pair), got {len(prices)}")
+            
+        n = self._count
+        if n == 0:
+            return []
+            
+        now = time.monotonic()
         
-        for i, alert in enumerate(self.alerts):
-            if i in self.triggered_alerts:
-                continue
-                
-            if alert.expires_at and now > alert.expires_at:
-                continue
-                
-            current_price = current_prices.get(alert.pair)
-            if not current_price:
-                continue
-                
-            is_triggered = False
-            if alert.condition == 'above' and current_price > alert.price:
-                is_triggered = True
-            elif alert.condition == 'below' and current_price < alert.price:
-                is_triggered = True
-                
-            if is_triggered:
-                triggered.append((i, alert))
-                self.triggered_alerts.add(i)
+        if NUMBA_AVAILABLE:
+            # One fused pass, no temporary arrays
+            out = np.empty(n, dtype=np.int64)
+            count = _check_kernel(
+                prices, self._pair_ix[:n], self._prices[:n], self._sign[:n],
+                self._expires[:n], self._triggered_mask[:n], now, out
+            )
+            hit_ids = out[:count].tolist()
+        else:
+            current = prices[self._pair_ix[:n]]
+            hit = (
+                (self._sign[:n] * (current - self._prices[:n]) > 0) &
+                (now <= self._expires[:n]) &
+                ~self._triggered_mask[:n]
+            )
+            self._triggered_mask[:n] |= hit
+            hit_ids = np.flatnonzero(hit).tolist()
+        
+        triggered = []
+        for i in hit_ids:
+            triggered.append((i, self.alerts[i]))
+            self.triggered_alerts.add(i)
         
         return triggered
     
+    def check_alerts_batch(self, prices: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+        """Evaluate all alerts against many ticks at once (e.g. backtest replay).
+
+        prices is a (ticks, pairs) matrix with columns ordered like known_pairs
+        and timestamps holds one epoch time per tick. Returns an array of
+        (tick, alert_id) rows for every hit. Alert state is not modified.
+        """
+        if prices.shape[1] != len(self._known_pairs):
+            raise ValueError(f"Expected {len(self._known_pairs)} price columns (one per known pair), got {prices.shape[1]}")
+            
+        n = self._count
+        if n == 0:
+            return np.empty((0, 2), dtype=np.intp)
+            
+        deltas = prices[:, self._pair_ix[:n]] - self._prices[None, :n]
+        hit = (self._sign[None, :n] * deltas) > 0
+        expires = self._expires[:n] + (time.time() - time.monotonic())  # Back to epoch time
+        hit &= timestamps[:, None] <= expires[None, :]
+        hit &= ~self._triggered_mask[None, :n]
+        return np.argwhere(hit)
+    
     async def process_triggered_alerts(self, triggered_alerts: List[tuple]):
         """Process triggered alerts"""
         for alert_id, alert in triggered_alerts:
@@ -169,49 +336,47 @@ class PriceAlertManager:
         """Play alert sound"""
         try:
             if self.sound_enabled:
-                sound_file = self.sounds.get(sound_type)
-                if sound_file and os.path.exists(sound_file):
-                    winsound.PlaySound(sound_file, winsound.SND_FILENAME | winsound.SND_ASYNC)
+                sound_data = self._sound_bufs.get(sound_type)
+                # Coalesce bursts: skip while a sound is still playing or queued
+                if sound_data and (self._sound_future is None or self._sound_future.done()):
+                    self._sound_future = self._sound_executor.submit(winsound.PlaySound, sound_data, winsound.SND_MEMORY)
         except Exception as e:
             logging.error(f"Error playing sound: {str(e)}")
     
+    def close(self):
+        """Stop the sound worker, dropping any queued sound"""
+        self._sound_executor.shutdown(wait=False, cancel_futures=True)
+    
     def toggle_sound(self, enabled: bool):
         """Toggle sound notifications"""
         self.sound_enabled = enabled
     
     def get_active_alerts(self) -> List[PriceAlert]:
         """Get list of active alerts"""
-        now = datetime.now().timestamp()
-        return [
-            alert for i, alert in enumerate(self.alerts)
-            if i not in self.triggered_alerts
-            and (not alert.expires_at or now <= alert.expires_at)
-        ]
+        n = self._count
+        now = time.monotonic()
+        active = ~self._triggered_mask[:n] & (now <= self._expires[:n])
+        return [self.alerts[i] for i in np.flatnonzero(active).tolist()]
     
     def get_triggered_alerts(self) -> List[PriceAlert]:
         """Get list of triggered alerts"""
-        return [
-            alert for i, alert in enumerate(self.alerts)
-            if i in self.triggered_alerts
-        ]
+        return [self.alerts[i] for i in np.flatnonzero(self._triggered_mask[:self._count]).tolist()]
     
     def export_alerts(self, filename: str = 'alerts.json'):
         """Export alerts to JSON file"""
         try:
-            with open(filename, 'w') as f:
-                json.dump(
-                    [{
-                        'pair': alert.pair,
-                        'condition': alert.condition,
-                        'price': alert.price,
-                        'notification_type': alert.notification_type,
-                        'created_at': alert.created_at.isoformat(),
-                        'expires_at': alert.expires_at.isoformat() if alert.expires_at else None,
-                        'triggered': alert.triggered
-                    } for alert in self.alerts],
-                    f,
-                    indent=2
-                )
+            # orjson serializes datetimes natively
+            records = [{
+                'pair': alert.pair,
+                'condition': alert.condition,
+                'price': alert.price,
+                'notification_type': alert.notification_type,
+                'created_at': alert.created_at,
+                'expires_at': alert.expires_at,
+                'triggered': alert.triggered
+            } for alert in self.alerts]
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         except Exception as e:
             logging.error(f"Error exporting alerts: {str(e)}")
     
@@ -219,20 +384,24 @@ class PriceAlertManager:
         """Import alerts from JSON file"""
         try:
             if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-                    self.alerts = [
+                with open(filename, 'rb') as f:
+                    data = orjson.loads(f.read())
+                    alerts = [
                         PriceAlert(
                             pair=alert['pair'],
                             condition=alert['condition'],
                             price=alert['price'],
                             notification_type=alert['notification_type'],
                             created_at=datetime.fromisoformat(alert['created_at']),
-                            expires_at=datetime.fromisoformat(alert['expires_at']) if alert['expires_at'] else None,
+                            expires_at=_epoch_seconds(alert['expires_at']),
                             triggered=alert['triggered']
                         )
                         for alert in data
                     ]
+                    # Only swap the alerts in once the arrays match them
+                    self._rebuild_arrays(alerts)
+                    self.alerts = alerts
+                    self.triggered_alerts.clear()
         except Exception as e:
             logging.error(f"Error importing alerts: {str(e)}")
             
@@ -242,7 +411,8 @@ class OpportunityAlertManager(PriceAlertManager):
     def __init__(self):
         super().__init__()
         self.min_profit_threshold = 1.0  # 1% minimum profit
-        self.opportunity_history = []
+        self.history_size = 100_000
+        self.clear_history()
         
     def set_profit_threshold(self, threshold: float):
         """Set minimum profit threshold for opportunities"""
@@ -259,6 +429,8 @@ class OpportunityAlertManager(PriceAlertManager):
                     'timestamp': datetime.now().isoformat(),
                     'opportunity': opportunity
                 })
+                self._profit_ring[self._history_total % self.history_size] = profit_percentage
+                self._history_total += 1
                 
                 # Play opportunity sound
                 self.play_alert_sound('opportunity')
@@ -280,16 +452,33 @@ class OpportunityAlertManager(PriceAlertManager):
         history = self.opportunity_history
         
         if min_profit is not None:
-            history = [
-                h for h in history
-                if h['opportunity']['profit_percentage'] >= min_profit
-            ]
+            idx = np.flatnonzero(self._history_profits() >= min_profit)
+            if limit:
+                idx = idx[-limit:]
+            if not len(idx):
+                return []
+                
+            # Walk only the span holding the matches instead of copying the whole deque
+            first, last = int(idx[0]), int(idx[-1])
+            keep = np.zeros(last - first + 1, dtype=bool)
+            keep[idx - first] = True
+            return list(itertools.compress(itertools.islice(history, first, last + 1), keep.tolist()))
         
         if limit:
-            history = history[-limit:]
+            return list(itertools.islice(history, max(len(history) - limit, 0), None))
             
-        return history
+        return list(history)
+    
+    def _history_profits(self) -> np.ndarray:
+        """Profit percentages aligned with opportunity_history (oldest first)"""
+        n = len(self.opportunity_history)
+        if n < self.history_size:
+            return self._profit_ring[:n]
+        start = self._history_total % self.history_size
+        return np.concatenate((self._profit_ring[start:], self._profit_ring[:start]))
     
     def clear_history(self):
         """Clear opportunity history"""
-        self.opportunity_history = []
+        self.opportunity_history = deque(maxlen=self.history_size)
+        self._profit_ring = np.zeros(self.history_size, dtype=np.float64)
+        self._history_total = 0
@@ -1,14 +1,119 @@
 import asyncio
 import aiohttp
+import hashlib
+import itertools
 import logging
+import os
+import random
+import time
+import numpy as np
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
 from collections import deque
-import json
+import orjson
+from yarl import URL
 from web3 import Web3
 
+try:
+    from .jit import njit
+except ImportError:
+    # Run as a script (python src/profit_hunter.py): src/ itself is on sys.path
+    from jit import njit
+
+# Hot-path price and score math stays in float; Decimal is only for order submission
+PRICE_TICK = Decimal('0.000000000001')
+
+def quantize_price(price: float) -> Decimal:
+    """Convert a float price to a tick-aligned Decimal for order submission"""
+    return Decimal(str(price)).quantize(PRICE_TICK)
+
+def opportunity_hash(key: str) -> int:
+    """Stable 64-bit id for an opportunity key, comparable across restarts"""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+
+# Hot paths timestamp with perf_counter_ns; this anchor maps those back to wall-clock time
+_CLOCK_ANCHOR_NS = time.time_ns() - time.perf_counter_ns()
+
+def ns_to_dt(ns: int) -> datetime:
+    """Convert a time.perf_counter_ns() timestamp to a local datetime for display"""
+    return datetime.fromtimestamp((ns + _CLOCK_ANCHOR_NS) / 1e9)
+
+@njit(cache=True, fastmath=True)
+def score_batch(liquidity, holder_growth, social_score, volume_growth):
+    """Opportunity scores (0-100) for columns of token metrics"""
+    return (
+        np.minimum(20.0, liquidity * 2e-4)         # Liquidity, full marks at $100k
+        + np.minimum(25.0, holder_growth * 0.125)  # Holder growth, full marks at 200
+        + np.minimum(25.0, social_score * 0.025)   # Social engagement, full marks at 1000
+        + np.minimum(30.0, volume_growth * 0.06)   # Volume growth, full marks at 500%
+    )
+
+class TokenBucket:
+    """Async token bucket allowing `rate` requests per `period` seconds"""
+    
+    def __init__(self, rate: float, period: float):
+        self.base_rate = rate / period
+        self.rate = self.base_rate
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.failure_count = 0
+        
+    async def __aenter__(self):
+        # Reserve a token now and sleep off any deficit, so waiters queue fairly
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+        
+    def record_failure(self):
+        """Count a rate-limited response, halving the rate after sustained 429s"""
+        self.failure_count += 1
+        if self.failure_count >= 3:
+            self.rate = max(self.base_rate / 16, self.rate / 2)
+            self.failure_count = 0
+            
+    def record_success(self):
+        """Reset failures and let a throttled rate recover gradually"""
+        self.failure_count = 0
+        self.rate = min(self.base_rate, self.rate * 1.25)
+
 class ProfitHunter:
+    # DexScreener accepts up to 30 comma-separated token addresses per request
+    DEXSCREENER_BATCH_SIZE = 30
+    METRIC_CACHE_SIZE = 10000
+    
+    # Request budgets per API host: (requests, seconds)
+    RATE_LIMITS = {
+        'dexscreener': (300, 60),
+        'coingecko': (50, 60)   # Free tier
+    }
+    EXECUTOR_QUEUE_SIZE = 64
+    EXECUTOR_WORKERS = 1   # More workers execute in parallel but share one capital check
+    STREAM_RESUBSCRIBE_INTERVAL = 5  # Seconds between tracked-token checks when the feed is idle
+    MAX_RETRIES = 4
+    BACKOFF_BASE = 1.0   # Seconds, doubled per retry
+    
+    # Markets watched by the scanners
+    PRICE_DEXES = ['raydium', 'orca', 'jupiter']
+    FLASH_PROTOCOLS = ['solend', 'port', 'mango']
+    SEEN_LISTINGS_LIMIT = 10000
+    
+    # Opportunity ring buffer: one fixed record per opportunity, oldest overwritten
+    OPPORTUNITY_RING_SIZE = 256
+    OPPORTUNITY_DTYPE = np.dtype([('hash', 'u8'), ('score', 'f4'), ('ts', 'f8'), ('kind', 'u1')])
+    OPPORTUNITY_KINDS = {'new_token': 0, 'price_gap': 1, 'flash_loan': 2}
+    
+    # Numeric token fields read by process_new_tokens
+    TOKEN_FIELDS = ('liquidity', 'marketCap', 'holderGrowth24h', 'socialScore', 'volumeGrowth24h')
+    
     def __init__(self, initial_capital: float = 500):
         self.capital = initial_capital
         self.daily_target = 100  # Adjusted to $100/day
@@ -21,15 +126,21 @@ class ProfitHunter:
             'telegram': 'https://api.telegram.org/'
         }
         
+        # Prebuilt request URLs, so aiohttp doesn't re-parse them every poll
+        self._dexscreener_tokens_url = URL(self.api_endpoints['dexscreener']) / 'tokens'
+        self._new_listings_url = self._dexscreener_tokens_url / 'newly_added'
+        
         # Track opportunities
-        self.opportunities = {
-            'new_tokens': deque(maxlen=100),
-            'price_gaps': deque(maxlen=50),
-            'flash_loans': deque(maxlen=25)
-        }
+        self.opportunities = np.zeros(self.OPPORTUNITY_RING_SIZE, dtype=self.OPPORTUNITY_DTYPE)
+        self.op_cursor = 0
+        # What each ring slot refers to (key, DEXes, path), overwritten along with the slot
+        self._op_details: List[Optional[Dict]] = [None] * self.OPPORTUNITY_RING_SIZE
+        self._op_kind_names = list(self.OPPORTUNITY_KINDS)
+        self._seen_listings = set()  # New listings already recorded
         
         # Memecoin specific tracking
         self.potential_memecoins = deque(maxlen=50)
+        self._tracking_addrs = set()  # Addresses in potential_memecoins
         self.pump_indicators = {
             'volume_spike': 5,      # Increased from 3x to 5x normal volume
             'holder_growth': 100,   # Increased from 50 to 100+ new holders/hour
@@ -51,189 +162,418 @@ class ProfitHunter:
             'flash': 1.01          # 1% for flash loans
         }
         
+        # Shared HTTP session, created lazily on first use
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Latest DEX prices, tokens x DEXes (NaN where a DEX has no pool)
+        self.price_matrix = np.empty((0, 0), dtype=np.float32)
+        self._pool_liquidity = np.empty((0, 0))
+        self._pool_address: Dict[tuple, str] = {}
+        self._matrix_tokens: List[str] = []
+        self._token_ix: Dict[str, int] = {}
+        self._dex_ix: Dict[str, int] = {}
+        
+        # Rows changed since the last gap check; watch_price_gaps creates the
+        # event inside the running loop (Python 3.9 binds Events on creation)
+        self._price_update_event: Optional[asyncio.Event] = None
+        self._dirty_rows = set()
+        
+        # Opportunities waiting for executor_loop; created in start() so it binds
+        # to the running loop (Python 3.9)
+        self._exec_q: Optional[asyncio.Queue] = None
+        
+        # Trade executors by opportunity kind
+        self._executors = {
+            'new_launch': self.execute_new_token_trade,
+            'price_gap': self.execute_price_gap_trade,
+            'flash_loan': self.execute_flash_loan
+        }
+        
+        # Per-host request rate limiting
+        self._buckets = {host: TokenBucket(rate, period) for host, (rate, period) in self.RATE_LIMITS.items()}
+        
+        # Short-lived metric cache: key -> (value, monotonic expiry)
+        self._metric_cache: Dict[tuple, tuple] = {}
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            # limit_per_host caps concurrent requests to any one API
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=5)
+            )
+        return self.session
+        
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        
+    async def _get_json(self, host: str, url: URL) -> Optional[Dict]:
+        """GET a JSON payload within the host's rate limit, backing off on 429s"""
+        session = await self._get_session()
+        bucket = self._buckets[host]
+        for attempt in range(self.MAX_RETRIES + 1):
+            async with bucket:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        bucket.record_success()
+                        return orjson.loads(await response.read())
+                    if response.status != 429:
+                        return None
+                    bucket.record_failure()
+                    try:
+                        retry_after = float(response.headers.get('Retry-After', 0))
+                    except ValueError:
+                        retry_after = 0
+                        
+            if attempt < self.MAX_RETRIES:
+                # Full jitter keeps concurrent retries from colliding
+                await asyncio.sleep(retry_after + random.uniform(0, self.BACKOFF_BASE * 2 ** attempt))
+                
+        logging.error(f"Rate limited by {host}, giving up on {url}")
+        return None
+        
+    async def _cached(self, key: tuple, ttl: float, coro_factory):
+        """Return a cached value for key, awaiting coro_factory() when missing or expired"""
+        now = time.monotonic()
+        entry = self._metric_cache.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+            
+        value = await coro_factory()
+        if len(self._metric_cache) >= self.METRIC_CACHE_SIZE:
+            # Drop expired entries before growing further
+            self._metric_cache = {k: v for k, v in self._metric_cache.items() if v[1] > now}
+        self._metric_cache[key] = (value, now + ttl)
+        return value
+        
+    def record_opportunity(self, key: str, score: float, kind: str, details: Optional[Dict] = None):
+        """Store an opportunity in the ring buffer, overwriting the oldest when full"""
+        slot = self.op_cursor % self.OPPORTUNITY_RING_SIZE
+        self.opportunities[slot] = (
+            opportunity_hash(key),
+            score,
+            time.time(),
+            self.OPPORTUNITY_KINDS[kind]
+        )
+        self._op_details[slot] = {'key': key, **(details or {})}
+        self.op_cursor += 1
+        
+    def top_opportunities(self, k: int, kind: Optional[str] = None) -> List[Dict]:
+        """Get the k highest-scoring recorded opportunities, best first"""
+        if k <= 0:
+            return []
+        slots = np.arange(min(self.op_cursor, self.OPPORTUNITY_RING_SIZE))
+        if kind is not None:
+            slots = slots[self.opportunities['kind'][slots] == self.OPPORTUNITY_KINDS[kind]]
+        scores = self.opportunities['score'][slots]
+        if k < len(slots):
+            best = np.argpartition(scores, -k)[-k:]
+            slots, scores = slots[best], scores[best]
+        slots = slots[np.argsort(scores)[::-1]]
+        
+        return [
+            {
+                **self._op_details[i],
+                'kind': self._op_kind_names[record['kind']],
+                'score': float(record['score']),
+                'ts': float(record['ts']),
+                'hash': int(record['hash'])
+            }
+            for i, record in zip(slots.tolist(), self.opportunities[slots])
+        ]
+        
     async def start(self):
         """Start all profit hunting strategies"""
-        async with aiohttp.ClientSession() as session:
-            self.session = session
-            
-            # Run all strategies concurrently
-            await asyncio.gather(
-                self.scan_new_tokens(),
-                self.monitor_price_gaps(),
-                self.find_flash_opportunities(),
+        await self._get_session()
+        self._exec_q = asyncio.Queue(maxsize=self.EXECUTOR_QUEUE_SIZE)
+        try:
+            # One shared poll feeds every scanner; a push feed, if any, runs alongside
+            tasks = [
+                self.unified_scan(),
+                self.watch_price_gaps(),
                 self.risk_manager(),
                 self.profit_tracker(),
-                self.scan_memecoin_potential(),
-                self.monitor_memecoin_positions()
-            )
+                self.monitor_memecoin_positions(),
+                *(self.executor_loop() for _ in range(self.EXECUTOR_WORKERS))
+            ]
+            if os.getenv('PRICE_STREAM_URL'):
+                tasks.append(self.monitor_price_gaps())
+                
+            await asyncio.gather(*tasks)
+        finally:
+            self._exec_q = None
+            await self.close()
             
+    async def unified_scan(self):
+        """Poll listings, trending tokens, DEX prices and flash loan rates in one pass"""
+        stream_prices = bool(os.getenv('PRICE_STREAM_URL'))
+        while True:
+            try:
+                # Fetch everything concurrently; one failed source doesn't block the rest
+                results = await asyncio.gather(
+                    self.get_new_listings(),
+                    self.get_trending_tokens(),
+                    self.get_flash_rates(self.FLASH_PROTOCOLS),
+                    asyncio.sleep(0) if stream_prices else self.get_dex_prices(self.get_tracked_tokens(), self.PRICE_DEXES),
+                    return_exceptions=True
+                )
+                for source, result in zip(('listings', 'trending', 'flash rates', 'prices'), results):
+                    if isinstance(result, Exception):
+                        logging.error(f"Unified scan {source} error: {str(result)}")
+                new_tokens, trending, flash_rates, _ = (
+                    None if isinstance(result, Exception) else result for result in results
+                )
+                
+                # Dispatch each result to its analyzer; price gaps are picked up by watch_price_gaps.
+                # A failing analyzer is logged on its own so the others still run this tick
+                try:
+                    self.process_new_tokens(new_tokens or [])
+                except Exception as e:
+                    logging.error(f"Token scanning error: {str(e)}")
+                    
+                if flash_rates is not None:
+                    try:
+                        await self.process_flash_rates(self.FLASH_PROTOCOLS, flash_rates)
+                    except Exception as e:
+                        logging.error(f"Flash loan error: {str(e)}")
+                        
+                try:
+                    await self.process_trending(trending or [])
+                except Exception as e:
+                    logging.error(f"Memecoin scanning error: {str(e)}")
+                
+                await asyncio.sleep(0.5)
+                
+            except Exception as e:
+                logging.error(f"Unified scan error: {str(e)}")
+                await asyncio.sleep(1)
+                
     async def scan_new_tokens(self) -> List[Dict]:
         """Scan for new token opportunities"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Get new token listings from multiple DEXs
-                tokens = []
-                
-                # DexScreener API
-                async with session.get(f"{self.api_endpoints['dexscreener']}tokens/newly_added") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        tokens.extend(data.get('tokens', []))
-                
-                # Filter and analyze tokens
-                opportunities = []
-                for token in tokens:
-                    if await self._analyze_token(token):
-                        opportunities.append({
-                            'address': token['address'],
-                            'symbol': token['symbol'],
-                            'price': token['price'],
-                            'liquidity': token['liquidity'],
-                            'score': await self._calculate_opportunity_score(token)
-                        })
-                
-                return sorted(opportunities, key=lambda x: x['score'], reverse=True)
-                
+            return self.process_new_tokens(await self.get_new_listings())
+            
         except Exception as e:
             logging.error(f"Token scanning error: {str(e)}")
             return []  # Return empty list instead of None
             
-    async def _analyze_token(self, token: Dict) -> bool:
-        """Analyze if token meets our criteria"""
-        try:
-            # Check minimum liquidity
-            if float(token.get('liquidity', 0)) < 50000:  # $50k minimum
-                return False
-                
-            # Check market cap
-            if float(token.get('marketCap', 0)) > 1000000:  # $1M maximum
-                return False
-                
-            # Check holder growth
-            if float(token.get('holderGrowth24h', 0)) < 100:  # 100+ new holders
-                return False
-                
-            # Verify contract features
-            if not all([
-                token.get('liquidityLocked', False),
-                token.get('ownershipRenounced', False),
-                token.get('contractVerified', False)
-            ]):
-                return False
-                
-            return True
-            
-        except Exception as e:
-            logging.error(f"Token analysis error: {str(e)}")
-            return False
-            
-    async def _calculate_opportunity_score(self, token: Dict) -> float:
-        """Calculate opportunity score (0-100)"""
-        try:
-            score = 0
-            
-            # Liquidity score (0-20)
-            liquidity = float(token.get('liquidity', 0))
-            score += min(20, (liquidity / 100000) * 20)
+    def process_new_tokens(self, tokens: List[Dict]) -> List[Dict]:
+        """Filter and score new listings, best first"""
+        if len(self._seen_listings) > self.SEEN_LISTINGS_LIMIT:
+            self._seen_listings.clear()
             
-            # Holder growth score (0-25)
-            holder_growth = float(token.get('holderGrowth24h', 0))
-            score += min(25, (holder_growth / 200) * 25)
-            
-            # Social engagement score (0-25)
-            social_score = float(token.get('socialScore', 0))
-            score += min(25, (social_score / 1000) * 25)
-            
-            # Volume growth score (0-30)
-            volume_growth = float(token.get('volumeGrowth24h', 0))
-            score += min(30, (volume_growth / 500) * 30)
-            
-            return score
+        # Pull the numeric fields into one column per field
+        rows = []
+        valid = []
+        for token in tokens:
+            try:
+                rows.append([float(token.get(key, 0)) for key in self.TOKEN_FIELDS])
+                valid.append(token)
+            except (TypeError, ValueError) as e:
+                logging.error(f"Token analysis error: {str(e)}")
+        if not valid:
+            return []
+        liquidity, market_cap, holder_growth, social_score, volume_growth = np.ascontiguousarray(np.array(rows).T)
+        
+        # Verify contract features
+        verified = np.array([
+            bool(token.get('liquidityLocked', False)
+                 and token.get('ownershipRenounced', False)
+                 and token.get('contractVerified', False))
+            for token in valid
+        ])
+        
+        passed = (
+            (liquidity >= 50000)          # $50k minimum liquidity
+            & (market_cap <= 1000000)     # $1M maximum market cap
+            & (holder_growth >= 100)      # 100+ new holders
+            & verified
+        )
+        scores = score_batch(liquidity, holder_growth, social_score, volume_growth)
+        
+        opportunities = []
+        for i in np.flatnonzero(passed):
+            token = valid[i]
+            score = float(scores[i])
             
-        except Exception as e:
-            logging.error(f"Score calculation error: {str(e)}")
-            return 0
+            # Listings repeat across polls; only record each one once
+            if token['address'] not in self._seen_listings:
+                self._seen_listings.add(token['address'])
+                self.record_opportunity(token['address'], score, 'new_token', {'symbol': token['symbol']})
+                
+            opportunities.append({
+                'address': token['address'],
+                'symbol': token['symbol'],
+                'price': token['price'],
+                'liquidity': token['liquidity'],
+                'score': score
+            })
             
+        return sorted(opportunities, key=lambda x: x['score'], reverse=True)
+        
     async def monitor_price_gaps(self):
-        """Find price differences across DEXes"""
+        """Keep price_matrix current for watch_price_gaps"""
+        # Monitor major DEXes
+        dexes = self.PRICE_DEXES
+        stream_url = os.getenv('PRICE_STREAM_URL')
+        
         while True:
             try:
-                # Monitor major DEXes
-                dexes = ['raydium', 'orca', 'jupiter']
-                
-                for token in self.get_tracked_tokens():
-                    prices = {}
-                    
-                    # Get prices from each DEX
-                    for dex in dexes:
-                        price = await self.get_token_price(token, dex)
-                        if price:
-                            prices[dex] = price
-                            
-                    if len(prices) < 2:
-                        continue
-                        
-                    # Calculate price differences
-                    min_price = min(prices.values())
-                    max_price = max(prices.values())
-                    gap = (max_price - min_price) / min_price
+                if stream_url:
+                    # Push feed; returns when the connection closes
+                    await self.stream_price_gaps(stream_url, dexes)
+                    await asyncio.sleep(1)
+                    continue
                     
-                    # If gap is profitable after fees
-                    if gap > 0.03:  # 3%+ difference
-                        opportunity = {
-                            'token': token,
-                            'buy_dex': min(prices.items(), key=lambda x: x[1])[0],
-                            'sell_dex': max(prices.items(), key=lambda x: x[1])[0],
-                            'potential_profit': gap,
-                            'type': 'price_gap'
-                        }
-                        
-                        self.opportunities['price_gaps'].append(opportunity)
-                        
-                        # If very profitable, act immediately
-                        if gap > 0.05:  # 5%+ difference
-                            await self.execute_opportunity(opportunity, 'price_gap')
-                            
+                # One batched request per 30 tokens covers every DEX
+                await self.get_dex_prices(self.get_tracked_tokens(), dexes)
+                
                 await asyncio.sleep(0.5)  # Fast monitoring
                 
             except Exception as e:
                 logging.error(f"Price monitoring error: {str(e)}")
                 await asyncio.sleep(1)
                 
-    async def find_flash_opportunities(self):
-        """Find flash loan arbitrage opportunities"""
+    async def stream_price_gaps(self, url: str, dexes: List[str]):
+        """Check price gaps as pair updates are pushed over a WebSocket feed"""
+        session = await self._get_session()
+        async with session.ws_connect(url, heartbeat=15) as ws:
+            tokens = None
+            while True:
+                # Resubscribe whenever the tracked token set changes
+                tracked = self.get_tracked_tokens()
+                if tracked != tokens:
+                    tokens = tracked
+                    self._reset_price_matrix(tokens, dexes)
+                    await ws.send_bytes(orjson.dumps({'type': 'subscribe', 'tokens': tokens}))
+                    
+                try:
+                    msg = await ws.receive(timeout=self.STREAM_RESUBSCRIBE_INTERVAL)
+                except asyncio.TimeoutError:
+                    continue
+                    
+                if msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    return
+                if msg.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    continue
+                    
+                # Updates arrive as DexScreener-style pairs
+                data = orjson.loads(msg.data)
+                for pair in data.get('pairs') or []:
+                    self.update_price_matrix(pair)
+                self._notify_price_update()
+                
+    async def watch_price_gaps(self):
+        """Check price gaps as soon as price_matrix rows are updated"""
+        self._price_update_event = asyncio.Event()
         while True:
             try:
-                # Monitor lending protocols
-                protocols = ['solend', 'port', 'mango']
-                
-                for protocol in protocols:
-                    # Get flash loan rates
-                    rates = await self.get_flash_loan_rates(protocol)
-                    
-                    # Find profitable paths
-                    paths = await self.find_profitable_paths(rates)
+                await self._price_update_event.wait()
+                self._price_update_event.clear()
+                
+                # Only re-check the rows that changed since the last pass
+                rows = np.fromiter(self._dirty_rows, dtype=np.intp, count=len(self._dirty_rows))
+                self._dirty_rows.clear()
+                if len(rows):
+                    await self.check_price_gaps(rows)
                     
-                    for path in paths:
-                        if path['expected_profit'] > 10:  # $10+ profit
-                            self.opportunities['flash_loans'].append({
-                                'path': path,
-                                'protocol': protocol,
-                                'found_at': datetime.now(),
-                                'type': 'flash_loan'
-                            })
-                            
-                            # If very profitable, execute
-                            if path['expected_profit'] > 20:  # $20+ profit
-                                await self.execute_opportunity(path, 'flash_loan')
-                                
-                await asyncio.sleep(1)
-                
             except Exception as e:
-                logging.error(f"Flash loan error: {str(e)}")
-                await asyncio.sleep(1)
-                
-    async def execute_opportunity(self, opportunity: Dict, type: str):
+                logging.error(f"Price gap check error: {str(e)}")
+                    
+    async def check_price_gaps(self, rows: Optional[np.ndarray] = None):
+        """Record and act on cross-DEX price gaps in the given price_matrix rows"""
+        if rows is None:
+            rows = np.arange(len(self._matrix_tokens))
+        dexes = list(self._dex_ix)
+        
+        # Calculate price differences for all rows at once
+        prices = self.price_matrix[rows]
+        listed = ~np.isnan(prices)
+        low = np.where(listed, prices, np.inf)
+        high = np.where(listed, prices, -np.inf)
+        buy_ix = low.argmin(axis=1)
+        sell_ix = high.argmax(axis=1)
+        ix = np.arange(len(rows))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gaps = high[ix, sell_ix] / low[ix, buy_ix] - 1
+        gaps[listed.sum(axis=1) < 2] = 0
+        
+        # If gap is profitable after fees
+        for k in np.flatnonzero(gaps > 0.03):  # 3%+ difference
+            gap = float(gaps[k])
+            token = self._matrix_tokens[rows[k]]
+            opportunity = {
+                'token': token,
+                'buy_dex': dexes[buy_ix[k]],
+                'sell_dex': dexes[sell_ix[k]],
+                'potential_profit': gap,
+                'type': 'price_gap'
+            }
+            
+            self.record_opportunity(token, gap, 'price_gap', {
+                'buy_dex': opportunity['buy_dex'],
+                'sell_dex': opportunity['sell_dex']
+            })
+            
+            # If very profitable, act immediately
+            if gap > 0.05:  # 5%+ difference
+                await self.submit_opportunity(opportunity, 'price_gap')
+                
+    async def get_flash_rates(self, protocols: List[str]) -> List:
+        """Get flash loan rates from all protocols at once"""
+        return await asyncio.gather(
+            *(self.get_flash_loan_rates(protocol) for protocol in protocols),
+            return_exceptions=True
+        )
+        
+    async def process_flash_rates(self, protocols: List[str], all_rates: List):
+        """Record and act on profitable flash loan paths"""
+        for protocol, rates in zip(protocols, all_rates):
+            if isinstance(rates, Exception):
+                logging.error(f"Flash loan rates error ({protocol}): {str(rates)}")
+                continue
+                
+            # Find profitable paths (None means none were found)
+            paths = await self.find_profitable_paths(rates) or []
+            
+            for path in paths:
+                if path['expected_profit'] > 10:  # $10+ profit
+                    self.record_opportunity(protocol, path['expected_profit'], 'flash_loan', {'path': path})
+                    
+                    # If very profitable, execute
+                    if path['expected_profit'] > 20:  # $20+ profit
+                        await self.submit_opportunity(path, 'flash_loan')
+                        
+    async def submit_opportunity(self, opportunity: Dict, kind: str):
+        """Queue an opportunity for the executor workers, or execute it inline if none are running"""
+        if self._exec_q is None:
+            await self.execute_opportunity(opportunity, kind)
+            return
+            
+        # Detection never waits on execution; a full queue means the opportunity is already stale
+        try:
+            self._exec_q.put_nowait((opportunity, kind))
+        except asyncio.QueueFull:
+            logging.warning(f"Executor queue full, dropping {kind} opportunity")
+            
+    async def executor_loop(self):
+        """Execute queued opportunities as they arrive"""
+        queue = self._exec_q
+        while True:
+            opportunity, kind = await queue.get()
+            await self.execute_opportunity(opportunity, kind)
+            queue.task_done()
+            
+    async def execute_opportunity(self, opportunity: Dict, kind: str):
         """Execute a trading opportunity"""
         try:
             # Check if we have enough capital
@@ -245,14 +585,9 @@ class ProfitHunter:
             if required_capital > self.max_per_trade:
                 required_capital = self.max_per_trade
                 
-            # Execute based on type
-            if type == 'new_launch':
-                success = await self.execute_new_token_trade(opportunity, required_capital)
-            elif type == 'price_gap':
-                success = await self.execute_price_gap_trade(opportunity, required_capital)
-            elif type == 'flash_loan':
-                success = await self.execute_flash_loan(opportunity)
-                
+            # Execute based on kind
+            success = await self._executors[kind](opportunity, required_capital)
+            
             if success:
                 self.trades_today += 1
                 self.profitable_trades += 1
@@ -308,94 +643,97 @@ class ProfitHunter:
                 logging.error(f"Profit tracking error: {str(e)}")
                 await asyncio.sleep(1)
                 
-    async def scan_memecoin_potential(self):
-        """Specifically scan for potential moonshot memecoins"""
-        while True:
-            try:
-                # Get trending tokens
-                trending = await self.get_trending_tokens()
-                
-                for token in trending:
-                    # Skip if already tracking
-                    if self.is_already_tracking(token['address']):
-                        continue
-                    
-                    # Deep memecoin analysis
-                    score = await self.analyze_memecoin_potential(token)
+    async def process_trending(self, trending: List[Dict]):
+        """Score untracked trending tokens and track or enter the best ones"""
+        # Skip if already tracking
+        candidates = [token for token in trending if not self.is_already_tracking(token['address'])]
+        
+        # Deep memecoin analysis of the whole batch
+        scores = await self.analyze_memecoin_batch(candidates)
+        
+        for token, score in zip(candidates, scores):
+            if score['total'] >= 80:
+                logging.info(f"High potential memecoin found: {token['symbol']}")
+                logging.info(f"Score breakdown: {orjson.dumps(score, option=orjson.OPT_INDENT_2).decode()}")
+                
+                self._push_potential({
+                    'token': token,
+                    'score': score,
+                    'found_at': time.perf_counter_ns(),  # See ns_to_dt
+                    'entry_price': token['price']
+                })
+                
+                # If extremely high potential, allocate more capital
+                if score['total'] >= 90:
+                    await self.execute_memecoin_entry(token, score)
                     
-                    if score['total'] >= 80:
-                        logging.info(f"High potential memecoin found: {token['symbol']}")
-                        logging.info(f"Score breakdown: {json.dumps(score, indent=2)}")
-                        
-                        self.potential_memecoins.append({
-                            'token': token,
-                            'score': score,
-                            'found_at': datetime.now(),
-                            'entry_price': token['price']
-                        })
-                        
-                        # If extremely high potential, allocate more capital
-                        if score['total'] >= 90:
-                            await self.execute_memecoin_entry(token, score)
-                
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logging.error(f"Memecoin scanning error: {str(e)}")
-                await asyncio.sleep(1)
-                
     async def analyze_memecoin_potential(self, token: Dict) -> Dict:
         """Deep analysis of memecoin potential"""
-        try:
-            # Initialize score components
-            score = {
-                'liquidity': 0,
-                'holders': 0,
-                'social': 0,
-                'safety': 0,
-                'momentum': 0
-            }
-            
-            # 1. Liquidity Analysis (20 points)
-            liquidity = float(token.get('liquidity', 0))
-            if liquidity > 50000:  # $50k+
-                score['liquidity'] = 20
-            elif liquidity > 20000:  # $20k+
-                score['liquidity'] = 15
-            elif liquidity > 10000:  # $10k+
-                score['liquidity'] = 10
-                
-            # 2. Holder Analysis (20 points)
-            holders = await self.get_holder_metrics(token['address'])
-            if holders['count'] > 100 and holders['growth_rate'] > 10:
-                score['holders'] = 20
-            elif holders['count'] > 50:
-                score['holders'] = 15
-                
-            # 3. Social Analysis (20 points)
-            social = await self.analyze_social_metrics(token['symbol'])
-            if social['telegram_members'] > 1000 and social['twitter_mentions'] > 100:
-                score['social'] = 20
-            elif social['telegram_members'] > 500:
-                score['social'] = 15
-                
-            # 4. Safety Checks (20 points)
-            safety = await self.deep_safety_check(token)
-            score['safety'] = safety['score']
-            
-            # 5. Momentum (20 points)
-            momentum = await self.analyze_momentum(token)
-            score['momentum'] = momentum['score']
-            
-            # Calculate total
-            score['total'] = sum(score.values())
-            
-            return score
-            
-        except Exception as e:
-            logging.error(f"Memecoin analysis error: {str(e)}")
-            return {'total': 0}
+        return (await self.analyze_memecoin_batch([token]))[0]
+        
+    async def analyze_memecoin_batch(self, tokens: List[Dict]) -> List[Dict]:
+        """Deep analysis of memecoin potential for many tokens at once"""
+        if not tokens:
+            return []
             
+        # Fetch every token's metrics concurrently
+        metrics = await asyncio.gather(
+            *(self._memecoin_metrics(token) for token in tokens),
+            return_exceptions=True
+        )
+        failed = np.zeros(len(tokens), dtype=bool)
+        for i, m in enumerate(metrics):
+            if isinstance(m, Exception) or not all(isinstance(part, dict) for part in m):
+                logging.error(f"Memecoin analysis error ({tokens[i]['address']}): {str(m)}")
+                failed[i] = True
+                metrics[i] = ({}, {}, {}, {})
+        
+        # Coerce per token so one bad value fails only that token, as before.
+        # float64 keeps scores and thresholds identical to the per-token path.
+        fields = [(0, 'count'), (0, 'growth_rate'), (1, 'telegram_members'),
+                  (1, 'twitter_mentions'), (2, 'score'), (3, 'score')]
+        rows = np.zeros((len(tokens), 1 + len(fields)), dtype=np.float64)
+        for i, (token, m) in enumerate(zip(tokens, metrics)):
+            if failed[i]:
+                continue
+            try:
+                rows[i] = [float(token.get('liquidity', 0))] + [float(m[source].get(key, 0)) for source, key in fields]
+            except (TypeError, ValueError) as e:
+                logging.error(f"Memecoin analysis error ({token['address']}): {str(e)}")
+                failed[i] = True
+                
+        liquidity, holder_count, holder_growth, telegram, twitter, safety, momentum = rows.T
+        
+        # Each component is worth up to 20 points
+        components = {
+            # $50k+ / $20k+ / $10k+
+            'liquidity': np.select([liquidity > 50000, liquidity > 20000, liquidity > 10000], [20, 15, 10], 0),
+            'holders': np.select([(holder_count > 100) & (holder_growth > 10), holder_count > 50], [20, 15], 0),
+            'social': np.select([(telegram > 1000) & (twitter > 100), telegram > 500], [20, 15], 0),
+            'safety': safety,
+            'momentum': momentum
+        }
+        totals = np.sum(list(components.values()), axis=0)
+        totals[failed] = 0
+        
+        columns = {name: values.tolist() for name, values in components.items()}
+        return [
+            {'total': 0} if failed[i] else
+            {**{name: values[i] for name, values in columns.items()}, 'total': float(totals[i])}
+            for i in range(len(tokens))
+        ]
+        
+    async def _memecoin_metrics(self, token: Dict) -> List[Dict]:
+        """Get (holders, social, safety, momentum) metrics for a token"""
+        address = token['address']
+        symbol = token['symbol']
+        return await asyncio.gather(
+            self._cached(('holders', address), 15, lambda: self.get_holder_metrics(address)),
+            self._cached(('social', symbol), 30, lambda: self.analyze_social_metrics(symbol)),
+            self._cached(('safety', address), 30, lambda: self.deep_safety_check(token)),
+            self._cached(('momentum', address), 5, lambda: self.analyze_momentum(token))
+        )
+        
     async def execute_memecoin_entry(self, token: Dict, score: Dict):
         """Enter a memecoin position with strict rules"""
         try:
@@ -408,10 +746,10 @@ class ProfitHunter:
             else:
                 position_size = base_size * 0.5
                 
-            # Set tight stops for safety
+            # Set tight stops for safety; order prices are tick-aligned Decimals from here on
             stops = {
-                'stop_loss': token['price'] * 0.9,  # 10% stop loss
-                'take_profit': token['price'] * 1.5, # 50% take profit
+                'stop_loss': quantize_price(token['price'] * 0.9),  # 10% stop loss
+                'take_profit': quantize_price(token['price'] * 1.5), # 50% take profit
                 'trailing_stop': 15  # 15% trailing stop once in profit
             }
             
@@ -461,7 +799,8 @@ class ProfitHunter:
     # Helper methods to be implemented
     async def get_new_listings(self) -> List[Dict]:
         """Get new token listings"""
-        pass
+        data = await self._get_json('dexscreener', self._new_listings_url)
+        return (data or {}).get('tokens', [])
         
     def basic_token_check(self, token: Dict) -> bool:
         """Quick token safety check"""
@@ -475,6 +814,78 @@ class ProfitHunter:
         """Get token price from DEX"""
         pass
         
+    async def get_dex_prices(self, tokens: List[str], dexes: List[str]) -> np.ndarray:
+        """Refresh self.price_matrix (tokens x DEXes) using batched DexScreener requests"""
+        self._reset_price_matrix(tokens, dexes)
+        tokens_iter = iter(tokens)
+        batches = []
+        while batch := list(itertools.islice(tokens_iter, self.DEXSCREENER_BATCH_SIZE)):
+            batches.append(batch)
+            
+        # Fetch all batches concurrently; a failed batch only drops its own tokens
+        results = await asyncio.gather(
+            *(self._fetch_dex_pairs(batch) for batch in batches),
+            return_exceptions=True
+        )
+        for pairs in results:
+            if isinstance(pairs, Exception):
+                logging.error(f"DEX price batch error: {str(pairs)}")
+                continue
+                
+            for pair in pairs:
+                self.update_price_matrix(pair)
+                
+        self._notify_price_update()
+        return self.price_matrix
+        
+    def _notify_price_update(self):
+        """Wake watch_price_gaps if any price_matrix rows changed"""
+        if self._dirty_rows and self._price_update_event is not None:
+            self._price_update_event.set()
+            
+    def _reset_price_matrix(self, tokens: List[str], dexes: List[str]):
+        """Clear self.price_matrix and index it by the given tokens and DEXes"""
+        shape = (len(tokens), len(dexes))
+        if self.price_matrix.shape != shape:
+            self.price_matrix = np.empty(shape, dtype=np.float32)
+            self._pool_liquidity = np.empty(shape)
+        self.price_matrix.fill(np.nan)
+        self._pool_liquidity.fill(-1)
+        self._pool_address.clear()
+        self._dirty_rows.clear()
+        self._matrix_tokens = list(tokens)
+        self._token_ix = {token: i for i, token in enumerate(tokens)}
+        self._dex_ix = {dex: j for j, dex in enumerate(dexes)}
+        
+    def update_price_matrix(self, pair: Dict) -> Optional[int]:
+        """Apply a DexScreener pair to self.price_matrix, returning the updated row"""
+        i = self._token_ix.get(pair.get('baseToken', {}).get('address'))
+        j = self._dex_ix.get(pair.get('dexId'))
+        price = pair.get('priceUsd')
+        if i is None or j is None or not price:
+            return None
+            
+        # Use the deepest pool when a DEX lists several pairs for a token
+        liquidity = float((pair.get('liquidity') or {}).get('usd') or 0)
+        address = pair.get('pairAddress')
+        same_pool = address is not None and address == self._pool_address.get((i, j))
+        if liquidity < self._pool_liquidity[i, j] and not same_pool:
+            return None
+        self._pool_liquidity[i, j] = liquidity
+        self._pool_address[(i, j)] = address
+        self.price_matrix[i, j] = float(price)
+        self._dirty_rows.add(i)
+        return i
+        
+    async def _fetch_dex_pairs(self, batch: List[str]) -> List[Dict]:
+        """Get DexScreener pairs for a batch of token addresses"""
+        data = await self._get_json('dexscreener', self._dexscreener_tokens_url / ','.join(batch))
+        return (data or {}).get('pairs') or []
+        
+    def get_tracked_tokens(self) -> List[str]:
+        """Get addresses of tokens being tracked for price gaps"""
+        return [memecoin['token']['address'] for memecoin in self.potential_memecoins]
+        
     async def get_flash_loan_rates(self, protocol: str) -> Dict:
         """Get flash loan rates from protocol"""
         pass
@@ -493,7 +904,14 @@ class ProfitHunter:
 
     def is_already_tracking(self, address: str) -> bool:
         """Check if token is already being tracked"""
-        pass
+        return address in self._tracking_addrs
+
+    def _push_potential(self, item: Dict):
+        """Track a potential memecoin, keeping the address set in step with the deque"""
+        if len(self.potential_memecoins) == self.potential_memecoins.maxlen:
+            self._tracking_addrs.discard(self.potential_memecoins[0]['token']['address'])
+        self.potential_memecoins.append(item)
+        self._tracking_addrs.add(item['token']['address'])
 
     async def get_holder_metrics(self, address: str) -> Dict:
         """Get holder metrics"""
@@ -512,7 +930,7 @@ class ProfitHunter:
         pass
 
     async def place_memecoin_orders(self, token: Dict, position_size: float, stops: Dict) -> bool:
-        """Place memecoin orders"""
+        """Place memecoin orders (stop prices arrive tick-aligned from quantize_price)"""
         pass
 
     def get_active_positions(self) -> List[Dict]:
@@ -527,7 +945,31 @@ class ProfitHunter:
         """Update memecoin stops"""
         pass
 
+    def calculate_required_capital(self, opportunity: Dict) -> float:
+        """Calculate capital needed for an opportunity"""
+        pass
+
+    async def execute_new_token_trade(self, opportunity: Dict, capital: float) -> bool:
+        """Execute a new token launch trade"""
+        pass
+
+    async def execute_price_gap_trade(self, opportunity: Dict, capital: float) -> bool:
+        """Execute a cross-DEX price gap trade"""
+        pass
+
+    async def execute_flash_loan(self, opportunity: Dict, capital: float) -> bool:
+        """Execute a flash loan arbitrage (capital is borrowed, so the argument is unused)"""
+        pass
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
+    
+    # uvloop is faster for this IO-heavy loop but isn't available on Windows
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+        
     hunter = ProfitHunter(initial_capital=500)
     asyncio.run(hunter.start())
@@ -1,17 +1,79 @@
+import asyncio
+import bisect
 import numpy as np
 from typing import Dict, List, Optional
-import aiohttp
 import json
 import logging
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime
+
+from .async_cache import singleflight, ttl_cache
+from .http_client import close_session, get_session
+from .jit import NUMBA_AVAILABLE, njit
+
+# Risk buckets: scores below 30 are low, below 60 medium, the rest high
+_RISK_THRESHOLDS = (30.0, 60.0)
+_RISK_LEVELS = ("Low Risk", "Medium Risk", "High Risk")
+_RISK_RECOMMENDATIONS = (
+    (
+        "✅ Low risk opportunity",
+        "📈 Standard trading parameters acceptable",
+        "🔄 Regular monitoring sufficient"
+    ),
+    (
+        "⚠️ Moderate risk - maintain standard precautions",
+        "💰 Consider standard position sizing",
+        "📊 Monitor market conditions"
+    ),
+    (
+        "⚠️ High risk detected - proceed with caution",
+        "🔍 Consider reducing trade size",
+        "⏰ Monitor execution closely"
+    )
+)
+
+# Spread buckets: up to 2% is low risk, up to 5% medium, wider high
+_SPREAD_THRESHOLDS = (2.0, 5.0)
+_SPREAD_RISK = (20.0, 50.0, 80.0)
+
+@njit(cache=True)
+def _log_return_std(prices):
+    """Population std of log returns in one pass (Welford), no temporary arrays"""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    prev = np.log(prices[0])
+    for i in range(1, prices.shape[0]):
+        cur = np.log(prices[i])
+        r = cur - prev
+        prev = cur
+        n += 1
+        delta = r - mean
+        mean += delta / n
+        m2 += delta * (r - mean)
+    return np.sqrt(m2 / n)
 
 class RiskCalculator:
+    # Seconds to collect volume lookups into one CoinGecko request
+    VOLUME_BATCH_WINDOW = 0.02
+    
     def __init__(self):
         self.price_history = {}
-        self.volatility_cache = {}
         self.liquidity_cache = {}
         self.last_update = datetime.now()
         
+        # Queued volume lookups, fetched together (see get_trading_volume)
+        self._pending_volume: Dict[str, asyncio.Future] = {}
+        self._volume_batch: List[str] = []
+        self._volume_flush: Optional[asyncio.Task] = None
+        
+        # In-flight requests and cached results per pair (see singleflight, ttl_cache)
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._ttl_caches: Dict[str, OrderedDict] = {}
+        
+        # Conditional GET headers per pair; a 304 reuses price_history[pair]
+        self._history_validators: Dict[str, Dict[str, str]] = {}
+        
         # Risk weights
         self.weights = {
             'volatility': 0.3,
@@ -30,20 +92,32 @@ class RiskCalculator:
             'Marinade': 30
         }
     
+    async def aclose(self):
+        """Release the shared HTTP session"""
+        await close_session()
+        
     async def calculate_risk_score(self, opportunity: Dict) -> Dict:
         """Calculate comprehensive risk score for an arbitrage opportunity"""
         try:
-            # Get various risk components
-            volatility_risk = await self.calculate_volatility_risk(opportunity['pair'])
-            liquidity_risk = await self.calculate_liquidity_risk(
-                opportunity['buy_dex'],
-                opportunity['sell_dex']
+            # Fetch the network-bound risk components concurrently
+            results = await asyncio.gather(
+                self.calculate_volatility_risk(opportunity['pair']),
+                self.calculate_liquidity_risk(
+                    opportunity['buy_dex'],
+                    opportunity['sell_dex']
+                ),
+                self.calculate_volume_risk(opportunity['pair']),
+                return_exceptions=True
+            )
+            # A failed component falls back to medium risk
+            volatility_risk, liquidity_risk, volume_risk = (
+                50.0 if isinstance(result, Exception) else result for result in results
             )
+            
             spread_risk = self.calculate_spread_risk(
                 opportunity['buy_price'],
                 opportunity['sell_price']
             )
-            volume_risk = await self.calculate_volume_risk(opportunity['pair'])
             smart_contract_risk = self.calculate_smart_contract_risk(
                 opportunity['buy_dex'],
                 opportunity['sell_dex']
@@ -82,33 +156,32 @@ class RiskCalculator:
     
     async def calculate_volatility_risk(self, pair: str) -> float:
         """Calculate volatility risk based on recent price movements"""
+        risk_score = await self._volatility_score(pair)
+        return 50.0 if risk_score is None else risk_score  # Default medium risk if no data
+        
+    @ttl_cache(300, maxsize=1024)
+    @singleflight
+    async def _volatility_score(self, pair: str) -> Optional[float]:
+        """Volatility risk score for a pair, or None without price data"""
         try:
-            # Check cache first
-            if pair in self.volatility_cache:
-                cache_time, volatility = self.volatility_cache[pair]
-                if datetime.now() - cache_time < timedelta(minutes=5):
-                    return volatility
-            
             # Get recent price history
             prices = await self.get_price_history(pair)
-            if not prices:
-                return 50.0  # Default medium risk if no data
+            if len(prices) < 2:
+                return None
             
             # Calculate volatility (standard deviation of returns)
-            returns = np.diff(np.log(prices))
-            volatility = np.std(returns) * 100
+            prices = np.asarray(prices, dtype=np.float64)
+            if NUMBA_AVAILABLE:
+                volatility = _log_return_std(prices) * 100
+            else:
+                volatility = np.std(np.diff(np.log(prices))) * 100
             
             # Normalize volatility to 0-100 scale
-            risk_score = min(100, volatility * 20)  # Adjust multiplier as needed
-            
-            # Cache the result
-            self.volatility_cache[pair] = (datetime.now(), risk_score)
-            
-            return risk_score
+            return min(100, volatility * 20)  # Adjust multiplier as needed
             
         except Exception as e:
             logging.error(f"Error calculating volatility risk: {str(e)}")
-            return 50.0
+            return None
     
     async def calculate_liquidity_risk(self, buy_dex: str, sell_dex: str) -> float:
         """Calculate liquidity risk based on DEX liquidity"""
@@ -130,20 +203,12 @@ class RiskCalculator:
     
     def calculate_spread_risk(self, buy_price: float, sell_price: float) -> float:
         """Calculate risk based on price spread"""
-        try:
-            spread_percentage = ((sell_price - buy_price) / buy_price) * 100
-            
-            # Larger spreads might indicate higher risk
-            if spread_percentage > 5:
-                return 80.0  # High risk
-            elif spread_percentage > 2:
-                return 50.0  # Medium risk
-            else:
-                return 20.0  # Low risk
-                
-        except Exception as e:
-            logging.error(f"Error calculating spread risk: {str(e)}")
+        if buy_price == 0:
             return 50.0
+        spread_percentage = ((sell_price - buy_price) / buy_price) * 100
+        
+        # Larger spreads might indicate higher risk; a spread on a threshold stays in the lower bucket
+        return _SPREAD_RISK[bisect.bisect_left(_SPREAD_THRESHOLDS, spread_percentage)]
     
     async def calculate_volume_risk(self, pair: str) -> float:
         """Calculate risk based on trading volume"""
@@ -175,16 +240,31 @@ class RiskCalculator:
             logging.error(f"Error calculating smart contract risk: {str(e)}")
             return 50.0
     
+    @singleflight
     async def get_price_history(self, pair: str) -> List[float]:
         """Get recent price history for a pair"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"https://api.coingecko.com/api/v3/coins/{pair}/market_chart?vs_currency=usd&days=1&interval=hourly"
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [price[1] for price in data['prices']]
+            session = await get_session()
+            async with session.get(
+                f"https://api.coingecko.com/api/v3/coins/{pair}/market_chart?vs_currency=usd&days=1&interval=hourly",
+                headers=self._history_validators.get(pair)
+            ) as response:
+                if response.status == 304 and pair in self.price_history:
+                    # Hourly series unchanged since the last fetch
+                    return self.price_history[pair]
+                if response.status == 200:
+                    data = await response.json()
+                    prices = [price[1] for price in data['prices']]
+                    
+                    validators = {}
+                    if 'ETag' in response.headers:
+                        validators['If-None-Match'] = response.headers['ETag']
+                    if 'Last-Modified' in response.headers:
+                        validators['If-Modified-Since'] = response.headers['Last-Modified']
+                    if validators:
+                        self.price_history[pair] = prices
+                        self._history_validators[pair] = validators
+                    return prices
             return []
         except Exception:
             return []
@@ -201,50 +281,49 @@ class RiskCalculator:
             'Marinade': 500000
         }.get(dex, 100000)
     
+    @ttl_cache(300, maxsize=1024, cache_falsy=False)
     async def get_trading_volume(self, pair: str) -> float:
         """Get 24h trading volume for a pair"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"https://api.coingecko.com/api/v3/simple/price?ids={pair}&vs_currencies=usd&include_24hr_vol=true"
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data[pair]['usd_24h_vol']
-            return 0
+            # Queue the pair; lookups within the batch window share one request
+            future = self._pending_volume.get(pair)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._pending_volume[pair] = future
+                self._volume_batch.append(pair)
+                if self._volume_flush is None:
+                    self._volume_flush = asyncio.create_task(self._flush_volume_batch())
+            return await asyncio.shield(future)
         except Exception:
             return 0
+            
+    async def _flush_volume_batch(self):
+        """Fetch every queued pair's volume in one request and resolve their futures"""
+        await asyncio.sleep(self.VOLUME_BATCH_WINDOW)
+        batch, self._volume_batch = self._volume_batch, []
+        futures = {pair: self._pending_volume.pop(pair) for pair in batch}
+        self._volume_flush = None
+        
+        volumes = {}
+        try:
+            # simple/price takes comma-separated ids, so one pair or many is the same call
+            session = await get_session()
+            async with session.get(
+                f"https://api.coingecko.com/api/v3/simple/price?ids={','.join(batch)}&vs_currencies=usd&include_24hr_vol=true"
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    volumes = {pair: data[pair].get('usd_24h_vol', 0) for pair in batch if pair in data}
+        except Exception as e:
+            logging.error(f"Error fetching trading volume: {str(e)}")
+        finally:
+            for pair, future in futures.items():
+                future.set_result(volumes.get(pair, 0))
     
     def get_risk_level(self, risk_score: float) -> str:
         """Convert numerical risk score to categorical level"""
-        if risk_score < 30:
-            return "Low Risk"
-        elif risk_score < 60:
-            return "Medium Risk"
-        else:
-            return "High Risk"
+        return _RISK_LEVELS[bisect.bisect_right(_RISK_THRESHOLDS, risk_score)]
     
     def get_risk_recommendations(self, risk_score: float) -> List[str]:
         """Get risk-based recommendations"""
-        recommendations = []
-        
-        if risk_score >= 60:
-            recommendations.extend([
-                "⚠️ High risk detected - proceed with caution",
-                "🔍 Consider reducing trade size",
-                "⏰ Monitor execution closely"
-            ])
-        elif risk_score >= 30:
-            recommendations.extend([
-                "⚠️ Moderate risk - maintain standard precautions",
-                "💰 Consider standard position sizing",
-                "📊 Monitor market conditions"
-            ])
-        else:
-            recommendations.extend([
-                "✅ Low risk opportunity",
-                "📈 Standard trading parameters acceptable",
-                "🔄 Regular monitoring sufficient"
-            ])
-        
-        return recommendations
+        return list(_RISK_RECOMMENDATIONS[bisect.bisect_right(_RISK_THRESHOLDS, risk_score)])
@@ -1,72 +1,167 @@
 import asyncio
 import logging
 from datetime import datetime
-from decimal import Decimal
 from typing import Dict, List, Optional
-import json
+import numpy as np
+import orjson
+from ..jit import NUMBA_AVAILABLE, njit
+
+# Take-profit stages: no target taken, first target taken, second taken (moonbag reserved)
+STAGE_OPEN, STAGE_FIRST, STAGE_MOONBAG = 0, 1, 2
+
+# Fraction of the remaining position sold at the first and second targets
+TAKE_PROFIT_SELL = 0.40
+
+@njit(cache=True, boundscheck=False)
+def _scan_positions(rows, prices, amount, stop, tps, stage, out_k, out_size):
+    """Fused stop/take-profit scan: writes sells to the out arrays, advances stage, returns the count"""
+    count = 0
+    for k in range(rows.shape[0]):
+        i = rows[k]
+        price = prices[k]
+        remaining = amount[i]
+        
+        if price <= stop[i] or price >= tps[i, 2]:
+            out_k[count] = k
+            out_size[count] = remaining
+            count += 1
+            continue
+            
+        if stage[i] == STAGE_OPEN and price >= tps[i, 0]:
+            sold = remaining * TAKE_PROFIT_SELL
+            out_k[count] = k
+            out_size[count] = sold
+            count += 1
+            remaining -= sold
+            stage[i] = STAGE_FIRST
+            
+        if stage[i] != STAGE_MOONBAG and price >= tps[i, 1]:
+            out_k[count] = k
+            out_size[count] = remaining * TAKE_PROFIT_SELL
+            count += 1
+            stage[i] = STAGE_MOONBAG
+    return count
 
 class SimulatedTrader:
+    # Per-position arrays, one row per open position, aligned with _pos_tokens
+    _POSITION_FIELDS = ('entry', 'current', 'amount', 'size', 'stop')
+    
     def __init__(self, initial_balance: float = 500.0):
-        self.initial_balance = Decimal(str(initial_balance))
+        self.initial_balance = float(initial_balance)
         self.current_balance = self.initial_balance
-        self.positions = {}
         self.trade_history = []
         self.start_time = datetime.utcnow()
         
+        # Open positions, stored column-wise so a tick checks them all at once
+        self._pos_tokens: List[str] = []
+        self._pos_index: Dict[str, int] = {}
+        self._pos = {field: np.empty(0) for field in self._POSITION_FIELDS}
+        self._pos['tps'] = np.empty((0, 3))  # first, second, moonbag target prices
+        self._pos['stage'] = np.empty(0, dtype=np.uint8)
+        
         # Performance tracking
         self.wins = 0
         self.losses = 0
         self.total_trades = 0
         
         # Risk management
-        self.max_position_size = self.initial_balance * Decimal('0.10')  # 10% max per trade
-        self.stop_loss_pct = Decimal('0.08')  # 8% stop loss
+        # Plain floats: simulation decisions don't need cent-exact Decimal math
+        self.max_position_size = self.initial_balance * 0.10  # 10% max per trade
+        self.stop_loss_pct = 0.08  # 8% stop loss
         self.take_profit_levels = {
-            'first': Decimal('1.30'),    # 30% first target
-            'second': Decimal('1.80'),   # 80% second target
-            'moonbag': Decimal('5.00')   # 5x moonbag target
+            'first': 1.30,    # 30% first target
+            'second': 1.80,   # 80% second target
+            'moonbag': 5.00   # 5x moonbag target
+        }
+        self._tp_multipliers = np.array([
+            self.take_profit_levels['first'],
+            self.take_profit_levels['second'],
+            self.take_profit_levels['moonbag']
+        ])
+        
+    @property
+    def positions(self) -> Dict[str, Dict]:
+        """Open positions by token, built from the position arrays"""
+        pos = self._pos
+        return {
+            token: {
+                'amount': float(pos['amount'][i]),
+                'entry_price': float(pos['entry'][i]),
+                'current_price': float(pos['current'][i]),
+                'position_size': float(pos['size'][i]),
+                'stop_loss': float(pos['stop'][i]),
+                'take_profits': dict(zip(('first', 'second', 'moonbag'), pos['tps'][i].tolist())),
+                'moonbag_reserved': bool(pos['stage'][i] == STAGE_MOONBAG)
+            }
+            for i, token in enumerate(self._pos_tokens)
         }
         
+    def _open_position(self, token_address: str, amount: float, price: float, position_size: float):
+        """Add a position row, replacing any open position in the same token"""
+        values = {
+            'entry': price,
+            'current': price,
+            'amount': amount,
+            'size': position_size,
+            'stop': price * (1 - self.stop_loss_pct),
+            'tps': price * self._tp_multipliers,
+            'stage': STAGE_OPEN
+        }
+        
+        i = self._pos_index.get(token_address)
+        if i is not None:
+            for field, value in values.items():
+                self._pos[field][i] = value
+            return
+            
+        self._pos_index[token_address] = len(self._pos_tokens)
+        self._pos_tokens.append(token_address)
+        for field, column in self._pos.items():
+            self._pos[field] = np.concatenate((column, np.array([values[field]], dtype=column.dtype)))
+            
+    def _close_position(self, token_address: str):
+        """Remove a position row, moving the last row into its place"""
+        i = self._pos_index.pop(token_address)
+        last = len(self._pos_tokens) - 1
+        if i != last:
+            moved = self._pos_tokens[last]
+            self._pos_tokens[i] = moved
+            self._pos_index[moved] = i
+            for column in self._pos.values():
+                column[i] = column[last]
+        self._pos_tokens.pop()
+        for field, column in self._pos.items():
+            self._pos[field] = column[:last]
+            
     async def execute_trade(self, token_address: str, action: str, amount: float, price: float) -> Dict:
         """Execute a simulated trade using real-time price data"""
         try:
-            amount = Decimal(str(amount))
-            price = Decimal(str(price))
-            
             if action.upper() == 'BUY':
-                if self.current_balance < amount * price:
-                    raise ValueError("Insufficient balance for trade")
-                    
-                # Execute buy
+                # Oversized signals are the common rejection, so check the cap first
                 position_size = amount * price
                 if position_size > self.max_position_size:
                     raise ValueError("Position size exceeds maximum allowed")
-                    
+                if position_size > self.current_balance:
+                    raise ValueError("Insufficient balance for trade")
+                
+                # Execute buy
                 self.current_balance -= position_size
-                self.positions[token_address] = {
-                    'amount': amount,
-                    'entry_price': price,
-                    'current_price': price,
-                    'position_size': position_size,
-                    'stop_loss': price * (1 - self.stop_loss_pct),
-                    'take_profits': {
-                        'first': price * self.take_profit_levels['first'],
-                        'second': price * self.take_profit_levels['second'],
-                        'moonbag': price * self.take_profit_levels['moonbag']
-                    },
-                    'moonbag_reserved': False
-                }
+                self._open_position(token_address, amount, price, position_size)
                 
             elif action.upper() == 'SELL':
-                if token_address not in self.positions:
+                i = self._pos_index.get(token_address)
+                if i is None:
                     raise ValueError("No open position for this token")
                     
-                position = self.positions[token_address]
-                profit = (price - position['entry_price']) * position['amount']
-                self.current_balance += position['amount'] * price
+                # Sell up to the whole position; the rest stays open
+                held = float(self._pos['amount'][i])
+                entry_price = float(self._pos['entry'][i])
+                amount = min(amount, held)
+                profit = (price - entry_price) * amount
+                self.current_balance += amount * price
                 
                 # Track performance
-                if price > position['entry_price']:
+                if price > entry_price:
                     self.wins += 1
                 else:
                     self.losses += 1
@@ -76,21 +171,24 @@ class SimulatedTrader:
                 self.trade_history.append({
                     'token': token_address,
                     'action': action,
-                    'amount': float(position['amount']),
-                    'entry_price': float(position['entry_price']),
-                    'exit_price': float(price),
-                    'profit': float(profit),
+                    'amount': amount,
+                    'entry_price': entry_price,
+                    'exit_price': price,
+                    'profit': profit,
                     'timestamp': datetime.utcnow().isoformat()
                 })
                 
-                del self.positions[token_address]
-                
+                if amount >= held:
+                    self._close_position(token_address)
+                else:
+                    self._pos['amount'][i] = held - amount
+                    
             return {
                 'success': True,
-                'balance': float(self.current_balance),
+                'balance': self.current_balance,
                 'action': action,
-                'amount': float(amount),
-                'price': float(price)
+                'amount': amount,
+                'price': price
             }
             
         except Exception as e:
@@ -102,48 +200,59 @@ class SimulatedTrader:
             
     async def update_positions(self, market_data: Dict):
         """Update positions with real-time market data"""
-        for token, data in market_data.items():
-            if token in self.positions:
-                position = self.positions[token]
-                current_price = Decimal(str(data['price']))
-                position['current_price'] = current_price
-                
-                # Check stop loss
-                if current_price <= position['stop_loss']:
-                    await self.execute_trade(token, 'SELL', position['amount'], current_price)
-                    continue
-                    
-                # Check take profit levels
-                if not position['moonbag_reserved']:
-                    if current_price >= position['take_profits']['first']:
-                        # Sell 40% at first target
-                        sell_amount = position['amount'] * Decimal('0.40')
-                        await self.execute_trade(token, 'SELL', sell_amount, current_price)
-                        position['amount'] -= sell_amount
-                        
-                    if current_price >= position['take_profits']['second']:
-                        # Sell another 40% at second target
-                        sell_amount = position['amount'] * Decimal('0.40')
-                        await self.execute_trade(token, 'SELL', sell_amount, current_price)
-                        position['amount'] -= sell_amount
-                        position['moonbag_reserved'] = True
-                        
-                    if current_price >= position['take_profits']['moonbag']:
-                        # Sell remaining at moonbag target
-                        await self.execute_trade(token, 'SELL', position['amount'], current_price)
-                        
+        tokens = [token for token in market_data if token in self._pos_index]
+        if not tokens:
+            return
+            
+        rows = np.fromiter((self._pos_index[token] for token in tokens), dtype=np.intp, count=len(tokens))
+        prices = np.fromiter((float(market_data[token]['price']) for token in tokens), dtype=np.float64, count=len(tokens))
+        pos = self._pos
+        pos['current'][rows] = prices
+        
+        # Check stop loss and take profit levels for every position at once
+        n = len(rows)
+        if NUMBA_AVAILABLE:
+            # One fused pass, no temporary masks; a position can take both targets in a tick
+            out_k = np.empty(2 * n, dtype=np.intp)
+            out_size = np.empty(2 * n)
+            count = _scan_positions(
+                rows, prices, pos['amount'], pos['stop'], pos['tps'], pos['stage'], out_k, out_size
+            )
+            sells = zip(out_k[:count].tolist(), out_size[:count].tolist())
+        else:
+            stage = pos['stage'][rows]
+            held = pos['amount'][rows]
+            tps = pos['tps'][rows]
+            close = (prices <= pos['stop'][rows]) | (prices >= tps[:, 2])
+            first = ~close & (stage == STAGE_OPEN) & (prices >= tps[:, 0])
+            second = ~close & (stage != STAGE_MOONBAG) & (prices >= tps[:, 1])
+            first_size = np.where(first, held * TAKE_PROFIT_SELL, 0.0)
+            second_size = (held - first_size) * TAKE_PROFIT_SELL
+            pos['stage'][rows[first]] = STAGE_FIRST
+            pos['stage'][rows[second]] = STAGE_MOONBAG
+            
+            sell_k = np.concatenate((np.flatnonzero(close), np.flatnonzero(first), np.flatnonzero(second)))
+            sell_size = np.concatenate((held[close], first_size[first], second_size[second]))
+            order = np.argsort(sell_k, kind='stable')
+            sells = zip(sell_k[order].tolist(), sell_size[order].tolist())
+            
+        # Only positions with a trigger reach Python: stop loss or moonbag target sells
+        # everything left, the first and second targets sell 40% each
+        for k, size in sells:
+            await self.execute_trade(tokens[k], 'SELL', size, float(prices[k]))
+            
     def get_performance_metrics(self) -> Dict:
         """Get current performance metrics"""
         win_rate = (self.wins / self.total_trades * 100) if self.total_trades > 0 else 0
         roi = ((self.current_balance / self.initial_balance) - 1) * 100
         
         return {
-            'current_balance': float(self.current_balance),
-            'initial_balance': float(self.initial_balance),
+            'current_balance': self.current_balance,
+            'initial_balance': self.initial_balance,
             'total_trades': self.total_trades,
-            'win_rate': float(win_rate),
-            'roi': float(roi),
-            'active_positions': len(self.positions),
+            'win_rate': win_rate,
+            'roi': roi,
+            'active_positions': len(self._pos_tokens),
             'trade_history': self.trade_history[-100:]  # Last 100 trades
         }
         
@@ -152,12 +261,12 @@ class SimulatedTrader:
         results = {
             'performance': self.get_performance_metrics(),
             'config': {
-                'initial_balance': float(self.initial_balance),
-                'max_position_size': float(self.max_position_size),
-                'stop_loss': float(self.stop_loss_pct),
-                'take_profit_levels': {k: float(v) for k, v in self.take_profit_levels.items()}
+                'initial_balance': self.initial_balance,
+                'max_position_size': self.max_position_size,
+                'stop_loss': self.stop_loss_pct,
+                'take_profit_levels': self.take_profit_levels
             }
         }
         
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=4)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
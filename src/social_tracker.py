@@ -1,22 +1,74 @@
 import logging
 from typing import Dict, List, Optional
 import aiohttp
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
+from collections import OrderedDict, defaultdict
 import asyncio
-import json
+import functools
+from itertools import chain
 import os
+import orjson
+import pandas as pd
 from dotenv import load_dotenv
+from .async_cache import singleflight, ttl_cache
+from .http_client import get_session
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# Sentiment keywords; each counts once per text however often it appears
+POSITIVE_WORDS = frozenset({'moon', 'pump', 'buy', 'bullish', 'gem', '100x', 'launch'})
+NEGATIVE_WORDS = frozenset({'dump', 'sell', 'bearish', 'rug', 'scam'})
+
+def _build_sentiment_automaton():
+    """One Aho-Corasick pass finds every keyword instead of a scan per word"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in POSITIVE_WORDS:
+        automaton.add_word(word, (word, 1))
+    for word in NEGATIVE_WORDS:
+        automaton.add_word(word, (word, -1))
+    automaton.make_automaton()
+    return automaton
+
+_SENTIMENT_AUTOMATON = _build_sentiment_automaton()
+
+@functools.lru_cache(maxsize=4096)
+def _sentiment_score(text: str) -> float:
+    """Simple rule-based sentiment (-1 to 1), cached because posts are re-fetched"""
+    text = text.lower()
+    if _SENTIMENT_AUTOMATON is not None:
+        hits = {match for _, match in _SENTIMENT_AUTOMATON.iter(text)}
+        pos_count = sum(1 for _, sign in hits if sign > 0)
+        neg_count = len(hits) - pos_count
+    else:
+        pos_count = sum(1 for word in POSITIVE_WORDS if word in text)
+        neg_count = sum(1 for word in NEGATIVE_WORDS if word in text)
+    
+    total = pos_count + neg_count
+    if total == 0:
+        return 0
+        
+    return (pos_count - neg_count) / total
+
 class SocialTracker:
-    def __init__(self):
+    # Channels fetched at once; lower concurrency keeps tail latency down
+    TELEGRAM_CONCURRENCY = 5
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         load_dotenv()
         
-        # Cache settings
-        self._cache = {}
-        self._cache_duration = timedelta(minutes=5)
+        # HTTP session: the caller's if given, otherwise the process-wide one
+        self.session = session
+        
+        # In-flight fetches and 5-minute results per tracker (see singleflight, ttl_cache)
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._ttl_caches: Dict[str, OrderedDict] = {}
         
         # Trend tracking
         self.trending_topics = defaultdict(lambda: {
@@ -37,6 +89,12 @@ class SocialTracker:
             'GemCalls'
         ]
         
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session for tracker requests"""
+        if self.session is not None and not self.session.closed:
+            return self.session
+        return await get_session()
+        
     async def track_social_trends(self) -> List[Dict]:
         """Track crypto trends across free social platforms"""
         try:
@@ -53,42 +111,60 @@ class SocialTracker:
             logger.error(f"Error tracking social trends: {str(e)}")
             return []
             
+    @ttl_cache(300, maxsize=256, cache_falsy=False)
+    @singleflight
     async def track_reddit_trends(self) -> List[Dict]:
         """Track trending crypto posts on Reddit"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.reddit_url) as response:
-                    if response.status != 200:
-                        return []
-                        
-                    data = await response.json()
-                    posts = data['data']['children']
-                    
-                    trends = []
-                    for post in posts:
-                        post_data = post['data']
-                        trends.append({
-                            'token': self._extract_token_symbol(post_data['title']),
-                            'mentions': 1,
-                            'engagement': post_data['score'] + post_data['num_comments'],
-                            'sentiment': self._analyze_sentiment(post_data['title']),
-                            'platform': 'reddit',
-                            'timestamp': datetime.fromtimestamp(post_data['created_utc'])
-                        })
-                    
-                    return trends
+            session = await self._get_session()
+            async with session.get(self.reddit_url) as response:
+                if response.status != 200:
+                    return []
                     
+                data = orjson.loads(await response.read())
+                posts = data['data']['children']
+                
+                trends = []
+                for post in posts:
+                    post_data = post['data']
+                    trends.append({
+                        'token': self._extract_token_symbol(post_data['title']),
+                        'mentions': 1,
+                        'engagement': post_data['score'] + post_data['num_comments'],
+                        'sentiment': self._analyze_sentiment(post_data['title']),
+                        'platform': 'reddit',
+                        'timestamp': datetime.fromtimestamp(post_data['created_utc'])
+                    })
+                
+                return trends
+                
         except Exception as e:
             logger.error(f"Error tracking Reddit: {str(e)}")
             return []
             
+    @ttl_cache(300, maxsize=256, cache_falsy=False)
+    @singleflight
     async def scrape_telegram_channels(self) -> List[Dict]:
         """Monitor Telegram channels for trading signals"""
         try:
+            # Fetch channels concurrently, a few at a time
+            sem = asyncio.Semaphore(self.TELEGRAM_CONCURRENCY)
+            
+            async def fetch(channel):
+                async with sem:
+                    # Use telethon or pyrogram to read public channels
+                    return await self._get_telegram_messages(channel)
+                    
+            results = await asyncio.gather(
+                *(fetch(channel) for channel in self.telegram_channels),
+                return_exceptions=True
+            )
+            
             trends = []
-            for channel in self.telegram_channels:
-                # Use telethon or pyrogram to read public channels
-                messages = await self._get_telegram_messages(channel)
+            for channel, messages in zip(self.telegram_channels, results):
+                if isinstance(messages, Exception):
+                    logger.error(f"Error reading Telegram channel {channel}: {str(messages)}")
+                    continue
                 for msg in messages:
                     if self._is_trading_signal(msg):
                         trends.append({
@@ -112,18 +188,7 @@ class SocialTracker:
         
     def _analyze_sentiment(self, text: str) -> float:
         """Simple rule-based sentiment analysis"""
-        positive_words = {'moon', 'pump', 'buy', 'bullish', 'gem', '100x', 'launch'}
-        negative_words = {'dump', 'sell', 'bearish', 'rug', 'scam'}
-        
-        text = text.lower()
-        pos_count = sum(1 for word in positive_words if word in text)
-        neg_count = sum(1 for word in negative_words if word in text)
-        
-        total = pos_count + neg_count
-        if total == 0:
-            return 0
-            
-        return (pos_count - neg_count) / total
+        return _sentiment_score(text)
         
     def _extract_token_symbol(self, text: str) -> Optional[str]:
         """Extract token symbol from text"""
@@ -132,26 +197,21 @@ class SocialTracker:
         
     def _merge_trends(self, trend_lists: List[List[Dict]]) -> List[Dict]:
         """Merge trends from different platforms"""
-        merged = defaultdict(lambda: {
-            'mentions': 0,
-            'engagement': 0,
-            'sentiment': 0,
-            'platforms': set(),
-            'first_seen': None
-        })
-        
-        for trends in trend_lists:
-            for trend in trends:
-                token = trend['token']
-                if not token:
-                    continue
-                    
-                merged[token]['mentions'] += trend['mentions']
-                merged[token]['engagement'] += trend['engagement']
-                merged[token]['sentiment'] += trend['sentiment']
-                merged[token]['platforms'].add(trend['platform'])
-                
-                if not merged[token]['first_seen'] or trend['timestamp'] < merged[token]['first_seen']:
-                    merged[token]['first_seen'] = trend['timestamp']
-        
-        return [{'token': k, **v} for k, v in merged.items()]
+        rows = list(chain.from_iterable(trends for trends in trend_lists if trends))
+        if not rows:
+            return []
+            
+        df = pd.DataFrame(rows, columns=['token', 'mentions', 'engagement', 'sentiment', 'platform', 'timestamp'])
+        df = df[df['token'].fillna('').astype(bool)]
+        if df.empty:
+            return []
+            
+        # One grouped reduction instead of a dict update per trend; keeps first-seen token order
+        merged = df.groupby('token', sort=False).agg(
+            mentions=('mentions', 'sum'),
+            engagement=('engagement', 'sum'),
+            sentiment=('sentiment', 'sum'),
+            platforms=('platform', set),
+            first_seen=('timestamp', 'min')
+        )
+        return merged.reset_index().to_dict('records')
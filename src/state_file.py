@@ -0,0 +1,65 @@
+"""Atomic writes for JSON state files such as simulation_results.json.
+
+The dashboard reads these files while the traders rewrite them, so each write
+goes to a temporary file that is renamed into place: readers see either the
+old or the new contents, never a half-written file. StateWriter also skips
+writes whose contents match the previous one.
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+
+import orjson
+
+WRITE_BUFFER_SIZE = 65536
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Last formatted second: trades often land in the same second
+_last_timestamp = [0, '']
+
+def format_now() -> str:
+    """Current local time as 'YYYY-MM-DD HH:MM:SS', formatted once per second"""
+    now = int(time.time())
+    if now != _last_timestamp[0]:
+        _last_timestamp[0] = now
+        _last_timestamp[1] = time.strftime(TIMESTAMP_FORMAT, time.localtime(now))
+    return _last_timestamp[1]
+
+def encode_state(obj) -> bytes:
+    """Serialize state to compact JSON bytes"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def write_atomic(path: str, data: bytes):
+    """Replace the file at path with data in one rename"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def write_json_atomic(path: str, obj):
+    """Serialize obj and write it to path atomically"""
+    write_atomic(path, encode_state(obj))
+
+class StateWriter:
+    """Writes a state file off the event loop, skipping unchanged payloads"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._last_digest = None
+        
+    async def write(self, obj) -> bool:
+        """Write obj unless it serializes to the same bytes as the last write"""
+        data = encode_state(obj)
+        digest = hashlib.blake2b(data, digest_size=8).digest()
+        if digest == self._last_digest:
+            return False
+        await asyncio.to_thread(write_atomic, self.path, data)
+        self._last_digest = digest
+        return True
@@ -2,9 +2,53 @@ import streamlit as st
 import plotly.graph_objs as go
 from datetime import datetime
 import pandas as pd
+from typing import Dict, List
 from .analytics_dashboard import TradingDashboard
 from .copy_trader import CopyTrader
 import asyncio
+import threading
+
+# Reruns fire on every widget interaction; reuse backend reads for a few seconds.
+# The leading underscore tells Streamlit not to hash the dashboard argument.
+DASHBOARD_CACHE_TTL = 5
+
+@st.cache_resource
+def _get_dashboard() -> TradingDashboard:
+    """Dashboard backend, built once per server process"""
+    return TradingDashboard()
+
+@st.cache_resource
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Event loop shared by every browser session, run in a background thread"""
+    # One loop per process: connections stay pooled across clicks and sessions
+    # don't each leave an open loop (and its selector) behind
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='dashboard-event-loop', daemon=True).start()
+    return loop
+
+def _run_async(coro):
+    """Run a coroutine on the shared event loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_event_loop()).result()
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL)
+def _portfolio_value(_dashboard: TradingDashboard) -> float:
+    return _dashboard.get_portfolio_value()
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL)
+def _change_24h(_dashboard: TradingDashboard) -> float:
+    return _dashboard.get_24h_change()
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL)
+def _total_pnl(_dashboard: TradingDashboard) -> float:
+    return _dashboard.get_total_pnl()
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL)
+def _active_positions(_dashboard: TradingDashboard) -> List[Dict]:
+    return _dashboard.get_active_positions()
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL)
+def _win_loss_ratio(_dashboard: TradingDashboard) -> Dict:
+    return _dashboard.get_win_loss_ratio()
 
 def run_dashboard():
     # Page config
@@ -15,7 +59,7 @@ def run_dashboard():
     )
     
     # Initialize the dashboard backend
-    dashboard = TradingDashboard()
+    dashboard = _get_dashboard()
     
     # Header
     st.title("Trading Bot Analytics Dashboard")
@@ -30,29 +74,30 @@ def run_dashboard():
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                total_value = dashboard.get_portfolio_value()
+                total_value = _portfolio_value(dashboard)
                 st.metric("Total Portfolio Value", f"{total_value:.2f} SOL")
                 
             with col2:
-                change_24h = dashboard.get_24h_change()
+                change_24h = _change_24h(dashboard)
                 st.metric("24h Change", f"{change_24h:+.2f}%")
                 
             with col3:
-                total_pnl = dashboard.get_total_pnl()
+                total_pnl = _total_pnl(dashboard)
                 st.metric("Total P/L", f"${total_pnl:+,.2f}")
             
             # Active Positions
             st.subheader("Active Positions")
-            positions = dashboard.get_active_positions()
+            positions = _active_positions(dashboard)
             if positions:
-                df_positions = pd.DataFrame(positions)
+                # Arrow-backed columns go to st.dataframe without an object->Arrow copy
+                df_positions = pd.DataFrame(positions).convert_dtypes(dtype_backend='pyarrow')
                 st.dataframe(df_positions)
             else:
                 st.info("No active positions")
             
             # Trading Performance
             st.subheader("Trading Performance")
-            win_loss = dashboard.get_win_loss_ratio()
+            win_loss = _win_loss_ratio(dashboard)
             col1, col2 = st.columns(2)
             
             with col1:
@@ -63,6 +108,8 @@ def run_dashboard():
                 
             # Add refresh button
             if st.button('Refresh Data'):
+                for cached in (_portfolio_value, _change_24h, _total_pnl, _active_positions, _win_loss_ratio):
+                    cached.clear()
                 st.experimental_rerun()
                 
         except Exception as e:
@@ -96,7 +143,8 @@ def run_dashboard():
             if st.session_state.copy_trader.test_trades:
                 st.subheader("Recent Test Trades")
                 df_trades = pd.DataFrame(st.session_state.copy_trader.test_trades)
-                df_trades['timestamp'] = pd.to_datetime(df_trades['timestamp'])
+                df_trades['timestamp'] = pd.to_datetime(df_trades['timestamp'], utc=True)
+                df_trades = df_trades.convert_dtypes(dtype_backend='pyarrow')
                 df_trades = df_trades.sort_values('timestamp', ascending=False)
                 st.dataframe(df_trades)
         
@@ -105,7 +153,7 @@ def run_dashboard():
         if st.button("Find Top Traders"):
             with st.spinner("Finding successful traders..."):
                 # Run async code in sync context
-                traders = asyncio.run(st.session_state.copy_trader.find_traders_to_copy())
+                traders = _run_async(st.session_state.copy_trader.find_traders_to_copy())
                 st.session_state.found_traders = traders
                 
         if 'found_traders' in st.session_state and st.session_state.found_traders:
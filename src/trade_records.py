@@ -0,0 +1,29 @@
+"""Fixed-field records for open positions and closed trades.
+
+Declared with __slots__ so each record is a compact object rather than a
+per-instance dict. orjson serializes them as JSON objects directly; use
+dataclasses.asdict where a caller expects a plain dict.
+"""
+from dataclasses import dataclass
+
+@dataclass
+class Trade:
+    """A trade as shown in the dashboard's recent trades"""
+    __slots__ = ('token', 'type', 'amount', 'price', 'profit', 'timestamp')
+    token: str
+    type: str  # 'BUY' or 'SELL'
+    amount: float
+    price: float
+    profit: float  # Percent
+    timestamp: str
+
+@dataclass
+class Position:
+    """An open position with its exit prices"""
+    __slots__ = ('token', 'entry_price', 'size', 'timestamp', 'stop_loss', 'take_profit')
+    token: str
+    entry_price: float
+    size: float
+    timestamp: str
+    stop_loss: float
+    take_profit: float
@@ -1,9 +1,13 @@
 import asyncio
 import logging
 from datetime import datetime
-import json
 import time
-import random
+from collections import deque
+
+import numpy as np
+
+from src.state_file import StateWriter, format_now, write_json_atomic
+from src.trade_records import Trade
 
 # Set up logging
 logging.basicConfig(
@@ -12,12 +16,33 @@ logging.basicConfig(
 )
 
 class LiveTestTrader:
+    TOKENS = ("PEPE", "DOGE", "SHIB", "FLOKI", "WOJAK")
+    TRADE_TYPES = ("BUY", "SELL")
+    
+    # Fake trades drawn per batch of random numbers
+    RANDOM_BATCH_SIZE = 1024
+    
     def __init__(self):
         self.test_balance = 500.0  # Start with $500
         self.positions = {}
-        self.trade_history = []
+        self._positions_view = []  # positions keys, rebuilt when positions change
+        self.trade_history = deque(maxlen=10)  # Keep only last 10 trades
         self.start_time = datetime.now()
         
+        # Dashboard stats over trade_history, updated as trades enter and leave it
+        self._closed_count = 0
+        self._winning_count = 0
+        self._moonshot_count = 0
+        
+        # Random trade fields are drawn in batches (see _refill_batch)
+        self._rng = np.random.default_rng()
+        self._batch_idx = 0
+        self._refill_batch()
+        
+        # Dashboard file is only rewritten after a trade changed it
+        self._state_writer = StateWriter('simulation_results.json')
+        self._dirty = False
+        
     async def initialize(self):
         """Initialize with default data"""
         initial_data = {
@@ -30,8 +55,7 @@ class LiveTestTrader:
         }
         
         # Save initial data
-        with open('simulation_results.json', 'w') as f:
-            json.dump(initial_data, f, indent=4)
+        write_json_atomic('simulation_results.json', initial_data)
             
         logging.info("Initialized test trader with $500")
         
@@ -51,72 +75,93 @@ class LiveTestTrader:
         except Exception as e:
             logging.error(f"Error in live testing: {str(e)}")
             
+    def _refill_batch(self):
+        """Draw the random fields for the next RANDOM_BATCH_SIZE fake trades"""
+        n = self.RANDOM_BATCH_SIZE
+        rng = self._rng
+        
+        # Random token and trade type
+        self._tokens = rng.integers(0, len(self.TOKENS), n).tolist()
+        self._types = rng.integers(0, len(self.TRADE_TYPES), n).tolist()
+        
+        # Amount between $10 and $50, price between $0.1 and $10, profit between -20% and +40%
+        self._amounts = np.round(rng.uniform(10, 50, n), 2).tolist()
+        self._prices = np.round(rng.uniform(0.1, 10, n), 2).tolist()
+        self._profits = np.round(rng.uniform(-20, 40, n), 2).tolist()
+        self._batch_idx = 0
+        
     async def generate_fake_trade(self):
         """Generate a fake trade"""
         try:
-            # Random token from a list
-            tokens = ["PEPE", "DOGE", "SHIB", "FLOKI", "WOJAK"]
-            token = random.choice(tokens)
-            
-            # Random trade type
-            trade_type = random.choice(["BUY", "SELL"])
-            
-            # Random amount between $10 and $50
-            amount = round(random.uniform(10, 50), 2)
-            
-            # Random price between $0.1 and $10
-            price = round(random.uniform(0.1, 10), 2)
-            
-            # Random profit between -20% and +40%
-            profit = round(random.uniform(-20, 40), 2)
-            
-            trade = {
-                "token": token,
-                "type": trade_type,
-                "amount": amount,
-                "price": price,
-                "profit": profit,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            # Update trade history
+            if self._batch_idx == self.RANDOM_BATCH_SIZE:
+                self._refill_batch()
+            i = self._batch_idx
+            self._batch_idx += 1
+            
+            token = self.TOKENS[self._tokens[i]]
+            trade_type = self.TRADE_TYPES[self._types[i]]
+            amount = self._amounts[i]
+            price = self._prices[i]
+            profit = self._profits[i]
+            
+            trade = Trade(
+                token=token,
+                type=trade_type,
+                amount=amount,
+                price=price,
+                profit=profit,
+                timestamp=format_now()
+            )
+            
+            # Update trade history, dropping the oldest trade's stats if it falls out
+            if len(self.trade_history) == self.trade_history.maxlen:
+                self._count_trade(self.trade_history[0], -1)
             self.trade_history.append(trade)
-            if len(self.trade_history) > 10:  # Keep only last 10 trades
-                self.trade_history = self.trade_history[-10:]
+            self._count_trade(trade, 1)
             
             # Update wallet balance based on profit/loss
             if trade_type == "SELL":
                 self.test_balance += (amount * profit / 100)
+            self._dirty = True
             
             logging.info(f"Generated trade: {trade}")
             
         except Exception as e:
             logging.error(f"Error generating fake trade: {str(e)}")
             
+    def _count_trade(self, trade: Trade, sign: int):
+        """Add (sign=1) or remove (sign=-1) a trade from the dashboard stats"""
+        if trade.type == "SELL":
+            self._closed_count += sign
+            if trade.profit > 0:
+                self._winning_count += sign
+        # Moonshots are trades with >20% profit
+        if trade.profit > 20:
+            self._moonshot_count += sign
+            
     async def update_dashboard(self):
         """Update dashboard with latest data"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        
         try:
             # Calculate win rate
-            closed_trades = [t for t in self.trade_history if t["type"] == "SELL"]
-            winning_trades = [t for t in closed_trades if t["profit"] > 0]
-            win_rate = (len(winning_trades) / len(closed_trades) * 100) if closed_trades else 0
-            
-            # Count moonshots (trades with >20% profit)
-            moonshots = len([t for t in self.trade_history if t["profit"] > 20])
+            win_rate = (self._winning_count / self._closed_count * 100) if self._closed_count else 0
             
             # Update simulation results
             data = {
                 "wallet_balance": round(self.test_balance, 2),
                 "win_rate": round(win_rate, 1),
-                "active_positions": list(self.positions.keys()),
-                "recent_trades": self.trade_history,
-                "moonshots": moonshots,
+                "active_positions": self._positions_view,
+                "recent_trades": list(self.trade_history),
+                "moonshots": self._moonshot_count,
                 "total_trades": len(self.trade_history)
             }
             
-            # Save to simulation_results.json
-            with open('simulation_results.json', 'w') as f:
-                json.dump(data, f, indent=4)
+            # Save to simulation_results.json without blocking the event loop
+            if not await self._state_writer.write(data):
+                return
                 
             logging.info(f"Dashboard updated - Balance: ${self.test_balance:.2f}, Win Rate: {win_rate:.1f}%")
             
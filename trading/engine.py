@@ -1,37 +1,65 @@
-import json
 import time
 from datetime import datetime
 from typing import Dict, List, Optional
 import logging
 import asyncio
+from collections import deque
+from dataclasses import asdict
 import numpy as np
 
-import aiohttp
+import orjson
 from solana.rpc.async_api import AsyncClient
 from pycoingecko import CoinGeckoAPI
 import pandas as pd
 from web3 import Web3
 
 from src.market_data import MarketDataHandler
+from src.http_client import close_session, get_session
 from src.social_tracker import SocialTracker
+from src.state_file import WRITE_BUFFER_SIZE, StateWriter, format_now
+from src.trade_records import Position, Trade
 
 class TradingEngine:
+    # Trades kept in memory and written to simulation_results.json
+    RECENT_TRADES = 10
+    
+    # Seconds between writes of the running metrics to database/metrics.json
+    METRICS_FLUSH_INTERVAL = 60
+    
     def __init__(self):
         self.config = self._load_config()
         self.market_data = MarketDataHandler()
         self.social_tracker = SocialTracker()
-        self.active_positions = {}
-        self.trade_history = []
+        self.active_positions: Dict[str, Position] = {}
+        self._positions_view: List[Position] = []  # active_positions values, rebuilt on change
         self.total_trades = 0
         self.winning_trades = 0
         
+        # Only the latest trades are kept; totals over all trades are running sums
+        self.trade_history = deque(maxlen=self.RECENT_TRADES)
+        self._total_pnl = 0.0
+        self._moonshots = 0
+        
+        # State is only written when a trade changed it (see _flush_state)
+        self._state_writer = StateWriter('simulation_results.json')
+        self._dirty = False
+        
+        # Running trade metrics, kept in memory and flushed periodically (see _flush_metrics)
+        self._metrics_writer = StateWriter('database/metrics.json')
+        try:
+            with open('database/metrics.json', 'rb') as f:
+                self._metrics = orjson.loads(f.read())
+        except:
+            self._metrics = {'total_trades': 0, 'volume': 0.0, 'total_profit': 0.0}
+        
         # Load previous simulation state
         try:
-            with open('simulation_results.json', 'r') as f:
-                data = json.load(f)
+            with open('simulation_results.json', 'rb') as f:
+                data = orjson.loads(f.read())
                 self.practice_balance = data['wallet_balance']
                 self.initial_balance = 500.0
-                self.trade_history = data.get('recent_trades', [])
+                for trade in data.get('recent_trades', []):
+                    self._record_trade(Trade(**trade))
                 self.total_trades = data.get('total_trades', 0)
                 self.winning_trades = int(data.get('win_rate', 0) * self.total_trades / 100)
         except:
@@ -39,83 +67,110 @@ class TradingEngine:
             self.practice_balance = 500.0
             self.initial_balance = 500.0
         
-        # Trading settings - more aggressive for memecoins
-        self.trade_interval = 2  # Check every 2 seconds
-        self.tokens = ['PEPE', 'DOGE', 'SHIB', 'FLOKI', 'WOJAK']
-        self.min_profit = 0.5  # Enter on smaller moves
-        self.max_loss = 1.0  # Tight stop loss
-        self.position_size_range = (20, 100)  # Larger positions
-        self.min_volume = 1000  # Lower volume requirement
-        
         # Trading settings from successful simulation
         self.trade_interval = 5  # Seconds between trades
         self.tokens = ['PEPE', 'DOGE', 'SHIB', 'FLOKI', 'WOJAK']
         self.min_profit = 3.0
         self.max_loss = 2.0
         self.position_size_range = (10, 45)
+        self.min_volume = 1000  # Lower volume requirement
+        
+        # Stop loss and take profit as multiples of the entry price
+        self._sl_mult = 1 - self.max_loss/100
+        self._tp_mult = 1 + self.min_profit/100
+        
+        # Entry randomness; a private generator rather than the global NumPy state
+        self._rng = np.random.default_rng()
         
     async def start(self):
         """Start the trading engine with real market data"""
         logging.info(f"Starting trading engine with practice account (${self.practice_balance:.2f})")
         
+        self.running = True
+        flusher = asyncio.create_task(self._flush_state())
+        metrics_flusher = asyncio.create_task(self._flush_metrics())
         try:
-            while True:
-                # Get real market data for our tokens
-                for token in self.tokens:
-                    try:
-                        # Get token data
-                        market_data = await self.market_data.get_token_data(token)
-                        if not market_data:
-                            continue
-                        
-                        # Check if we should enter a position
-                        if token not in self.active_positions and len(self.active_positions) < 3:
-                            if self._should_enter_position(market_data):
-                                size = self._calculate_position_size()
-                                await self._enter_position(token, size, market_data)
+            # Ticks run on a fixed cadence, so fetch latency doesn't stretch the interval
+            next_tick = time.monotonic()
+            while self.running:
+                # Get real market data for all our tokens at once
+                results = await asyncio.gather(
+                    *(self.market_data.get_token_data(token) for token in self.tokens),
+                    return_exceptions=True
+                )
+                market_data = {}
+                for token, data in zip(self.tokens, results):
+                    if isinstance(data, Exception):
+                        logging.error(f"Error processing {token}: {str(data)}")
+                    elif data:
+                        market_data[token] = data
                         
-                        # Update existing position
-                        elif token in self.active_positions:
-                            await self._update_position(token, market_data)
-                            
-                    except Exception as e:
-                        logging.error(f"Error processing {token}: {str(e)}")
-                        continue
-                
-                # Save current state
-                self._save_state()
+                # Update existing positions
+                held = [token for token in market_data if token in self.active_positions]
+                for token in held:
+                    await self._update_position(token, market_data[token])
+                    
+                # Check which other tokens we should enter, all in one pass
+                candidates = [token for token in market_data if token not in held]
+                for token in self._entry_candidates(candidates, market_data):
+                    if len(self.active_positions) >= 3 or self.practice_balance < self.position_size_range[0]:
+                        break
+                    size = self._calculate_position_size()
+                    await self._enter_position(token, size, market_data[token])
                 
-                # Wait before next iteration
-                await asyncio.sleep(self.trade_interval)
+                # Wait out the rest of this interval
+                next_tick += self.trade_interval
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif delay < -self.trade_interval:
+                    # Far behind schedule: start a new cadence rather than run back-to-back ticks
+                    next_tick = time.monotonic()
                 
         except Exception as e:
             logging.error(f"Error in trading engine: {str(e)}")
-            
-    def _should_enter_position(self, market_data: Dict) -> bool:
-        """Check if we should enter a position based on market data"""
+        finally:
+            flusher.cancel()
+            metrics_flusher.cancel()
+            if self._dirty:
+                await self._save_state()
+            await self._save_metrics()
+            await close_session()
+            
+    async def _flush_state(self):
+        """Save state at most once per trade interval, and only after a change"""
+        while True:
+            await asyncio.sleep(self.trade_interval)
+            if self._dirty:
+                self._dirty = False
+                await self._save_state()
+                
+    async def _flush_metrics(self):
+        """Save the running metrics once per METRICS_FLUSH_INTERVAL"""
+        while True:
+            await asyncio.sleep(self.METRICS_FLUSH_INTERVAL)
+            await self._save_metrics()
+            
+    def _entry_candidates(self, tokens: List[str], market_data: Dict) -> List[str]:
+        """Tokens whose market data passes the entry checks, evaluated as arrays"""
         try:
-            # Check volume
-            if market_data['volume_24h'] < self.min_volume:
-                return False
-            
-            # Check price momentum - look for any small movement
-            if abs(market_data['price_change_1h']) < self.min_profit:
-                return False
-            
-            # Check if we have enough balance
-            min_position = self.position_size_range[0]
-            if self.practice_balance < min_position:
-                return False
-            
-            # Add randomness to entries (30% chance)
-            if np.random.random() > 0.3:
-                return False
-            
-            return True
+            n = len(tokens)
+            if n == 0:
+                return []
+            volumes = np.fromiter((market_data[t]['volume_24h'] for t in tokens), dtype=np.float64, count=n)
+            changes = np.fromiter((market_data[t]['price_change_1h'] for t in tokens), dtype=np.float64, count=n)
+            
+            # Enough volume, a price move of at least min_profit, and randomness (30% chance)
+            mask = (
+                (volumes >= self.min_volume) &
+                (np.abs(changes) >= self.min_profit) &
+                (self._rng.random(n) <= 0.3)
+            )
+            return [tokens[i] for i in np.flatnonzero(mask)]
             
         except Exception as e:
             logging.error(f"Error in entry check: {str(e)}")
-            return False
+            return []
             
     def _calculate_position_size(self) -> float:
         """Calculate position size based on available balance"""
@@ -135,17 +190,19 @@ class TradingEngine:
             if size > self.practice_balance:
                 return
             
-            position = {
-                'token': token,
-                'entry_price': market_data['price'],
-                'size': size,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'stop_loss': market_data['price'] * (1 - self.max_loss/100),
-                'take_profit': market_data['price'] * (1 + self.min_profit/100)
-            }
+            position = Position(
+                token=token,
+                entry_price=market_data['price'],
+                size=size,
+                timestamp=format_now(),
+                stop_loss=market_data['price'] * self._sl_mult,
+                take_profit=market_data['price'] * self._tp_mult
+            )
             
             self.practice_balance -= size
             self.active_positions[token] = position
+            self._positions_view = list(self.active_positions.values())
+            self._dirty = True
             
             # Log entry
             logging.info(f"Entered {token} position: ${size:.2f} @ ${market_data['price']:.2f}")
@@ -160,29 +217,29 @@ class TradingEngine:
             current_price = market_data['price']
             
             # Calculate profit/loss
-            profit_pct = ((current_price - position['entry_price']) / position['entry_price']) * 100
+            profit_pct = ((current_price - position.entry_price) / position.entry_price) * 100
             
             # Check if we should exit
             should_exit = (
-                current_price <= position['stop_loss'] or
-                current_price >= position['take_profit'] or
+                current_price <= position.stop_loss or
+                current_price >= position.take_profit or
                 abs(profit_pct) > 50  # Take big wins/cut big losses
             )
             
             if should_exit:
                 # Calculate position value
-                position_value = position['size'] * (1 + profit_pct/100)
+                position_value = position.size * (1 + profit_pct/100)
                 self.practice_balance += position_value
                 
                 # Record trade
-                self.trade_history.append({
-                    'token': token,
-                    'type': 'SELL',
-                    'amount': position['size'],
-                    'price': current_price,
-                    'profit': profit_pct,
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
+                self._record_trade(Trade(
+                    token=token,
+                    type='SELL',
+                    amount=position.size,
+                    price=current_price,
+                    profit=profit_pct,
+                    timestamp=format_now()
+                ))
                 
                 # Update stats
                 self.total_trades += 1
@@ -191,6 +248,8 @@ class TradingEngine:
                 
                 # Remove position
                 del self.active_positions[token]
+                self._positions_view = list(self.active_positions.values())
+                self._dirty = True
                 
                 # Log exit
                 logging.info(f"Exited {token} position: {profit_pct:.2f}% profit")
@@ -198,7 +257,16 @@ class TradingEngine:
         except Exception as e:
             logging.error(f"Error updating position: {str(e)}")
             
-    def _save_state(self):
+    def _record_trade(self, trade: Trade):
+        """Add a closed trade to the recent history and the running totals"""
+        self.trade_history.append(trade)
+        
+        # Profit is a percentage of the position value
+        self._total_pnl += trade.amount * trade.price * trade.profit / 100
+        if trade.profit > 100:
+            self._moonshots += 1
+            
+    async def _save_state(self):
         """Save current trading state"""
         try:
             win_rate = (self.winning_trades / self.total_trades * 100) if self.total_trades > 0 else 0
@@ -207,13 +275,13 @@ class TradingEngine:
                 'wallet_balance': round(self.practice_balance, 2),
                 'win_rate': round(win_rate, 1),
                 'total_trades': self.total_trades,
-                'moonshots': sum(1 for trade in self.trade_history if trade['profit'] > 100),
-                'active_positions': list(self.active_positions.values()),
-                'recent_trades': self.trade_history[-10:]  # Keep last 10 trades
+                'moonshots': self._moonshots,
+                'active_positions': self._positions_view,
+                'recent_trades': list(self.trade_history)
             }
             
-            with open('simulation_results.json', 'w') as f:
-                json.dump(state, f, indent=4)
+            # Serialized on the loop so the snapshot is consistent; written off it
+            await self._state_writer.write(state)
                 
         except Exception as e:
             logging.error(f"Error saving state: {str(e)}")
@@ -225,16 +293,18 @@ class TradingEngine:
             market_data = {}
             tokens = self._get_tracked_tokens()
             
-            async with aiohttp.ClientSession() as session:
-                tasks = []
-                for token in tokens:
-                    task = self._fetch_token_data(session, token)
-                    tasks.append(task)
-                results = await asyncio.gather(*tasks)
+            # Shared keep-alive session for the engine's lifetime (closed when start() exits)
+            session = await get_session()
+            tasks = []
+            for token in tokens:
+                task = self._fetch_token_data(session, token)
+                tasks.append(task)
+            results = await asyncio.gather(*tasks)
+            
+            for token, data in zip(tokens, results):
+                market_data[token] = data
                 
-                for token, data in zip(tokens, results):
-                    market_data[token] = data
-                    
+
             return market_data
         except Exception as e:
             logging.error(f"Error getting market data: {str(e)}")
@@ -271,15 +341,24 @@ class TradingEngine:
     async def _get_volume_data(self) -> Dict:
         """Get volume data across exchanges"""
         try:
-            volume_data = {}
             tokens = self._get_tracked_tokens()
             
-            for token in tokens:
-                data = self.cg.get_coin_market_chart_by_id(
+            # pycoingecko is blocking; run the calls in threads, all at once
+            results = await asyncio.gather(*(
+                asyncio.to_thread(
+                    self.cg.get_coin_market_chart_by_id,
                     token,
                     vs_currency='usd',
                     days=1
                 )
+                for token in tokens
+            ), return_exceptions=True)
+            
+            volume_data = {}
+            for token, data in zip(tokens, results):
+                if isinstance(data, Exception):
+                    logging.error(f"Error getting volume data for {token}: {str(data)}")
+                    continue
                 volume_data[token] = data
                 
             return volume_data
@@ -373,51 +452,42 @@ class TradingEngine:
             logging.error(f"Error executing trade: {str(e)}")
     
     def _log_trade(self, trade_params: Dict):
-        """Log trade details to database"""
+        """Append trade details to the trade log, one JSON object per line"""
         try:
-            with open('database/trade_history.json', 'r+') as f:
-                trades = json.load(f)
-                trades.append({
-                    'timestamp': datetime.now().isoformat(),
-                    **trade_params
-                })
-                f.seek(0)
-                json.dump(trades, f, indent=4)
+            entry = {
+                'timestamp': datetime.now().isoformat(),
+                **trade_params
+            }
+            with open('database/trade_history.jsonl', 'ab', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY))
+                f.write(b'\n')
         except Exception as e:
             logging.error(f"Error logging trade: {str(e)}")
     
     async def _update_metrics(self, trade_params: Dict):
         """Update trading metrics after a trade"""
         try:
-            with open('database/metrics.json', 'r+') as f:
-                metrics = json.load(f)
-                
-                # Update relevant metrics
-                metrics['total_trades'] += 1
-                metrics['volume'] += trade_params['amount']
-                
-                if trade_params.get('profit'):
-                    metrics['total_profit'] += trade_params['profit']
-                    
-                f.seek(0)
-                json.dump(metrics, f, indent=4)
+            metrics = self._metrics
+            metrics['total_trades'] += 1
+            metrics['volume'] += trade_params['amount']
+            
+            if trade_params.get('profit'):
+                metrics['total_profit'] += trade_params['profit']
         except Exception as e:
             logging.error(f"Error updating metrics: {str(e)}")
+            
+    async def _save_metrics(self):
+        """Write the running metrics to database/metrics.json if they changed"""
+        try:
+            await self._metrics_writer.write(self._metrics)
+        except Exception as e:
+            logging.error(f"Error saving metrics: {str(e)}")
     
     def get_trading_metrics(self) -> Dict:
         """Get current trading metrics"""
         try:
-            # Calculate total profit/loss
-            total_pnl = 0
-            for trade in self.trade_history:
-                # Convert percentage to decimal and multiply by position size
-                profit_decimal = trade['profit'] / 100
-                position_value = trade['amount'] * trade['price']
-                trade_pnl = position_value * profit_decimal
-                total_pnl += trade_pnl
-            
             # Update wallet balance with profits/losses
-            current_balance = round(self.initial_balance + total_pnl, 2)
+            current_balance = round(self.initial_balance + self._total_pnl, 2)
             
             # Calculate win rate
             if self.total_trades > 0:
@@ -429,9 +499,9 @@ class TradingEngine:
                 'wallet_balance': current_balance,
                 'win_rate': win_rate,
                 'total_trades': self.total_trades,
-                'moonshots': sum(1 for trade in self.trade_history if trade['profit'] > 100),
-                'active_positions': list(self.active_positions.values()),
-                'recent_trades': self.trade_history[-10:]  # Keep last 10 trades
+                'moonshots': self._moonshots,
+                'active_positions': [asdict(position) for position in self.active_positions.values()],
+                'recent_trades': [asdict(trade) for trade in self.trade_history]
             }
             
         except Exception as e:
@@ -448,8 +518,8 @@ class TradingEngine:
     def _load_config(self) -> Dict:
         """Load trading configuration"""
         try:
-            with open('config/trading_config.json', 'r') as f:
-                return json.load(f)
+            with open('config/trading_config.json', 'rb') as f:
+                return orjson.loads(f.read())
         except Exception as e:
             logging.error(f"Error loading config: {str(e)}")
             return {}